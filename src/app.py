@@ -6,12 +6,45 @@ project_root = Path(__file__).parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from fastapi import FastAPI  # noqa: E402
+import json  # noqa: E402
+import asyncio  # noqa: E402
+from typing import AsyncIterator, Literal  # noqa: E402
+from datetime import datetime  # noqa: E402
+from contextlib import asynccontextmanager  # noqa: E402
+from loguru import logger  # noqa: E402
+from fastapi import FastAPI, HTTPException, Query  # noqa: E402
 from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
-from src.score.score_records import reconstruct_event, Event  # noqa: E402
+from fastapi.responses import StreamingResponse  # noqa: E402
+from pydantic import BaseModel, Field  # noqa: E402
+from src.score.score_records import (  # noqa: E402
+    reconstruct_event,
+    reconstruct_events,
+    rescore_records,
+    Event,
+    Weights,
+    WEIGHT_CHANNELS,
+)
+from src.records.content import content_cache  # noqa: E402
+from src.score.rerank import score_cache  # noqa: E402
+from src.score.risk import risk_cache  # noqa: E402
+from src.utils import close_http_client  # noqa: E402
+from src.jobs import JobManager  # noqa: E402
+from src.results import result_store, diff_results  # noqa: E402
+
+
+job_manager = JobManager()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await job_manager.start()
+    yield
+    await job_manager.stop()
+    # 关闭共享的 HTTP 连接池
+    await close_http_client()
 
 
-app = FastAPI(title="Event Investigation API")
+app = FastAPI(title="Event Investigation API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -38,6 +71,327 @@ async def reconstruct(event: Event) -> dict:
     return result
 
 
+@app.post("/reconstruct/batch")
+async def reconstruct_batch(events: list[Event]) -> list[dict]:
+    """
+    批量重构多个事件的相关记录，参与人相同的事件共用一次记录获取
+
+    Args:
+        events: 事件信息列表
+
+    Returns:
+        list[dict]: 与 events 一一对应的结果，格式同 /reconstruct
+    """
+
+    return await reconstruct_events(events)
+
+
+def encode_frame(frame: dict, format: str) -> str:
+    data = json.dumps(frame, ensure_ascii=False)
+    if format == "sse":
+        return f"event: {frame['type']}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+async def stream_frames(event: Event) -> AsyncIterator[dict]:
+    queue: asyncio.Queue[dict | None] = asyncio.Queue()
+
+    async def run():
+        try:
+            result = await reconstruct_events(
+                [event],
+                on_record=lambda _, record: queue.put_nowait({"type": "record", "record": record}),
+                on_risk=lambda _, risk: queue.put_nowait({"type": "risk", **risk}),
+            )
+            queue.put_nowait(
+                {
+                    "type": "summary",
+                    "result_id": result[0]["result_id"],
+                    "event": result[0]["event"],
+                    "stats": result[0]["stats"],
+                    # 最终（按开始时间排序后）的记录顺序
+                    "record_ids": [record["record_id"] for record in result[0]["records"]],
+                }
+            )
+        except Exception as e:
+            logger.exception(f"事件 {event.event_name} 流式重构失败: {e}")
+            queue.put_nowait({"type": "error", "error": str(e)})
+        finally:
+            queue.put_nowait(None)
+
+    task = asyncio.create_task(run())
+    try:
+        while (frame := await queue.get()) is not None:
+            yield frame
+    finally:
+        # 客户端断开连接时停止重构
+        task.cancel()
+
+
+@app.post("/reconstruct/stream")
+async def reconstruct_stream(event: Event, format: Literal["ndjson", "sse"] = "ndjson") -> StreamingResponse:
+    """
+    流式重构事件相关记录，每条记录打分完成后立即返回，无需等待全部记录获取完毕
+
+    依次返回以下帧（每帧包含 "type" 字段）：
+    - record: 相关记录，格式同 /reconstruct 的记录（"risk" 为 None），按打分完成的顺序返回
+    - risk: 风险评估结果 {"record_id", "channel", "risk"}，仅 ai_check_record 为 true 时返回
+    - summary: 事件信息、记录筛选统计和排序后的记录 ID 列表 "record_ids"
+    - error: 重构失败时返回，之后不再有其他帧
+
+    Args:
+        event: 事件信息
+        format: ndjson（每行一个 JSON）或 sse（Server-Sent Events，事件名为帧类型）
+
+    Returns:
+        StreamingResponse: 流式响应
+    """
+
+    async def body() -> AsyncIterator[str]:
+        async for frame in stream_frames(event):
+            yield encode_frame(frame, format)
+
+    if format == "sse":
+        return StreamingResponse(
+            body(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+def submit_job(events: list[Event]) -> dict:
+    try:
+        job = job_manager.submit(events)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=429, detail="任务队列已满，请稍后重试", headers={"Retry-After": "30"})
+    return {"job_id": job.id, "status": job.status}
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(event: Event) -> dict:
+    """
+    提交事件重构任务，立即返回任务 ID，任务在后台执行
+
+    Args:
+        event: 事件信息
+
+    Returns:
+        dict: {"job_id": 任务 ID, "status": "queued"}，任务队列已满时返回 429
+    """
+
+    return submit_job([event])
+
+
+@app.post("/jobs/batch", status_code=202)
+async def create_batch_job(events: list[Event]) -> dict:
+    """
+    提交多事件批量重构任务，立即返回任务 ID，任务在后台执行
+
+    Args:
+        events: 事件信息列表
+
+    Returns:
+        dict: {"job_id": 任务 ID, "status": "queued"}，任务队列已满时返回 429
+    """
+
+    return submit_job(events)
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> dict:
+    """
+    查询任务状态、各阶段进度，任务完成后包含结果
+
+    Args:
+        job_id: 任务 ID
+
+    Returns:
+        dict: 任务状态（queued/running/succeeded/failed/cancelled）、进度和结果（与事件一一对应的列表）
+    """
+
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="任务不存在或已过期")
+    return job.to_dict()
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str) -> dict:
+    """
+    取消任务，等待中的任务不再执行，执行中的任务立即停止
+
+    Args:
+        job_id: 任务 ID
+
+    Returns:
+        dict: 任务状态
+    """
+
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="任务不存在或已过期")
+    return job.to_dict(include_result=False)
+
+
+@app.get("/jobs")
+async def job_stats() -> dict:
+    """
+    获取后台任务统计
+
+    Returns:
+        dict: worker 数、等待中和执行中的任务数
+    """
+
+    return job_manager.stats()
+
+
+def parse_time(value: str | None, name: str) -> float | None:
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"{name} 格式错误，应为 '2026-01-19T15:00:00'")
+
+
+async def load_result(result_id: str) -> dict:
+    result = await asyncio.to_thread(result_store.load, result_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"结果不存在: {result_id}")
+    return result
+
+
+@app.get("/results")
+async def list_results(
+    event_name: str | None = None,
+    start_time: str | None = None,
+    end_time: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+) -> dict:
+    """
+    分页列出已保存的重构结果（按保存时间倒序），只返回索引信息，不含记录
+
+    Args:
+        event_name: 只列出该事件的结果
+        start_time: 只列出该时间之后保存的结果，格式为 '2026-01-19T15:00:00'
+        end_time: 只列出该时间之前保存的结果，格式同 start_time
+        limit: 每页条目数，最多 100
+        offset: 跳过的条目数
+
+    Returns:
+        dict: {"total": 符合条件的结果总数, "limit", "offset", "results": [{"id", "event_name", "event_time", "created_at", "record_count", "path", "size"}]}
+    """
+
+    total, entries = await asyncio.to_thread(
+        result_store.query,
+        event_name=event_name,
+        start_time=parse_time(start_time, "start_time"),
+        end_time=parse_time(end_time, "end_time"),
+        limit=limit,
+        offset=offset,
+    )
+    return {"total": total, "limit": limit, "offset": offset, "results": entries}
+
+
+@app.get("/results/diff")
+async def diff_result(base: str, target: str) -> dict:
+    """
+    比较同一事件的两次重构结果（例如调整权重后），无需重新执行重构
+
+    Args:
+        base: 基准结果 ID
+        target: 对比结果 ID
+
+    Returns:
+        dict: 事件参数变化、记录筛选统计、新增/移除/得分或风险变化的记录（不含内容）
+    """
+
+    base_result, target_result = await asyncio.gather(load_result(base), load_result(target))
+    return diff_results(base_result, target_result)
+
+
+@app.get("/results/{result_id}")
+async def get_result(result_id: str) -> dict:
+    """
+    获取已保存的重构结果，不重新请求 CCS、Reranker 和 LLM
+
+    Args:
+        result_id: 结果 ID
+
+    Returns:
+        dict: 结果，格式同 /reconstruct
+    """
+
+    return await load_result(result_id)
+
+
+class RescoreRequest(BaseModel):
+    result_id: str = Field(..., description="已保存的结果 ID")
+    relevance: int | None = Field(default=None, description="新的相关性阈值，默认沿用原结果的阈值")
+    weights: Weights | None = Field(default=None, description="新的打分权重，默认沿用原结果的权重")
+    weight_channels: dict[str, int] | None = Field(
+        default=None, description="新的渠道权重，只需包含需要修改的渠道，其余渠道使用默认权重"
+    )
+
+
+@app.post("/rescore")
+async def rescore(request: RescoreRequest) -> dict:
+    """
+    按新的权重、阈值和渠道权重重新计算已保存结果的综合得分并筛选，不请求 CCS、Reranker 和 LLM
+
+    只能对原结果中的记录重新打分：原结果中未保存的记录（低于原阈值）不会出现在结果中。
+    仅提高阈值、权重不变时结果与重新重构相同（"complete" 为 true）。
+
+    Args:
+        request: 结果 ID 和新的打分参数
+
+    Returns:
+        dict: {"result_id", "event": 更新打分参数后的事件信息, "weight_channels", "stats": {"stored": 原结果记录数, "relevant": 新阈值下的记录数}, "complete", "records"}
+    """
+
+    result = await load_result(request.result_id)
+    event = result["event"]
+    relevance = request.relevance if request.relevance is not None else event.get("relevance")
+    weights = request.weights or (Weights(**event["weights"]) if event.get("weights") else None)
+    if relevance is None or weights is None:
+        raise HTTPException(status_code=422, detail="原结果缺少 relevance 或 weights，请在请求中指定")
+    weight_channels = {**WEIGHT_CHANNELS, **(request.weight_channels or {})}
+
+    records = rescore_records(result["records"], weights, relevance, weight_channels)
+    complete = (
+        weights.model_dump() == event.get("weights")
+        and weight_channels == WEIGHT_CHANNELS
+        and event.get("relevance") is not None
+        and relevance >= event["relevance"]
+    )
+    return {
+        "result_id": request.result_id,
+        "event": {**event, "relevance": relevance, "weights": weights.model_dump()},
+        "weight_channels": weight_channels,
+        "stats": {"stored": len(result["records"]), "relevant": len(records)},
+        "complete": complete,
+        "records": records,
+    }
+
+
+@app.get("/cache/stats")
+async def cache_stats() -> dict:
+    """
+    获取本地缓存的命中统计
+
+    Returns:
+        dict: 各缓存的条目数、大小、命中数和未命中数
+    """
+
+    return {
+        "content": content_cache.stats(),
+        "rerank_scores": score_cache.stats(),
+        "risk": risk_cache.stats(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     
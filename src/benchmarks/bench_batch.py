@@ -0,0 +1,54 @@
+"""
+多事件批量重构基准测试
+
+对比逐个调用 reconstruct_event 与一次调用 reconstruct_events 重构多个
+同一天、同一批用户的事件时，CCS 请求数和耗时。
+
+运行: python -m src.benchmarks.bench_batch
+"""
+
+import time
+import asyncio
+
+from src.score import rerank
+from src.score.score_records import Event, reconstruct_event, reconstruct_events
+from src.benchmarks.mock_ccs import StandInCCSServer
+from src.benchmarks.mock_reranker import StandInRerankerServer
+
+
+EVENT_NAMES = ["CALL 内容", "EMAIL 内容", "QTRADE 内容", "IDEAL 内容"]
+LATENCY = 0.1
+
+
+async def main():
+    events = [
+        Event(
+            event_name=event_name,
+            event_time="2026-01-19T14:00:00",
+            internal_users=["1772917751770292225"],
+            external_users=["韩梅梅", "周子航"],
+            relevance=60,
+            weights={"time": 30, "user": 30, "content": 40},
+        )
+        for event_name in EVENT_NAMES
+    ]
+
+    with StandInCCSServer(latency=LATENCY, records_per_participant=300) as ccs, StandInRerankerServer(latency=LATENCY):
+        for label in ("逐个重构", "批量重构"):
+            # 每轮使用新的内存得分缓存，两轮的 Reranker 请求数相同
+            rerank.score_cache = rerank.ScoreCache(maxsize=100_000, persistent=False)
+            requests = ccs.requests
+            start = time.perf_counter()
+            if label == "逐个重构":
+                results = [await reconstruct_event(event) for event in events]
+            else:
+                results = await reconstruct_events(events)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{label}: 事件数 {len(events)}, CCS 请求数 {ccs.requests - requests}, "
+                f"相关记录数 {[len(result['records']) for result in results]}, 耗时 {elapsed:.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
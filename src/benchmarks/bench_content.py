@@ -0,0 +1,55 @@
+"""
+内容分块获取基准测试
+
+对比一次请求获取所有记录内容与按分块并发获取的耗时，以及首个分块到达的时间；
+并对比本地内容缓存冷启动与命中时的耗时。
+
+运行: python -m src.benchmarks.bench_content
+"""
+
+import time
+import asyncio
+
+from src.records import content
+from src.records.content import iter_hydrated_records
+from src.utils.cache import SqliteCache
+from src.benchmarks.mock_ccs import StandInCCSServer
+
+
+N_RECORDS = 500
+LATENCY = 0.2
+
+
+async def hydrate(records: list[dict], chunk_size: int) -> tuple[float, float, int]:
+    start = time.perf_counter()
+    first_chunk = None
+    hydrated = 0
+    async for chunk in iter_hydrated_records(records, "CALL", chunk_size=chunk_size):
+        first_chunk = first_chunk or time.perf_counter() - start
+        hydrated += len(chunk)
+    return first_chunk, time.perf_counter() - start, hydrated
+
+
+async def main():
+    records = [{"id": f"CALL-user-0-{i}"} for i in range(N_RECORDS)]
+    with StandInCCSServer(latency=LATENCY) as server:
+        for chunk_size in (N_RECORDS, 50):
+            first_chunk, total, hydrated = await hydrate(records, chunk_size)
+            print(
+                f"分块大小 {chunk_size}: 首个分块 {first_chunk:.2f}s, "
+                f"总耗时 {total:.2f}s, 记录数 {hydrated}"
+            )
+
+        # 使用独立的缓存文件，不影响正式的内容缓存
+        content.CACHE_ENABLED = True
+        content.content_cache = SqliteCache("bench_content")
+        content.content_cache.clear()
+        for label in ("缓存冷启动", "缓存命中"):
+            requests = server.requests
+            _, total, hydrated = await hydrate(records, 50)
+            print(f"{label}: 总耗时 {total:.2f}s, 内容请求数 {server.requests - requests}")
+        print(f"缓存统计: {content.content_cache.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
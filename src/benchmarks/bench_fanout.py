@@ -0,0 +1,58 @@
+"""
+多渠道并发获取基准测试
+
+对比逐个渠道、逐个参与人依次获取与 fan_out_records 并发获取的总耗时。
+并发获取的总耗时应接近单次最慢查询（记录查询 + 内容查询），而不是所有查询之和。
+
+运行: python -m src.benchmarks.bench_fanout
+"""
+
+import time
+import asyncio
+
+from src.records import fan_out_records
+from src.records.fanout import CHANNEL_ITERATORS
+from src.records.content import hydrate_records
+from src.benchmarks.mock_ccs import StandInCCSServer
+
+
+PARTICIPANT_IDS = [f"user-{i}" for i in range(4)]
+START_TIME = "2026-01-19 00:00:00"
+END_TIME = "2026-01-19 23:59:59"
+LATENCY = 0.2
+
+
+async def fetch_sequential() -> list[dict]:
+    records = []
+    for channel, iterator in CHANNEL_ITERATORS.items():
+        channel_records = {}
+        for participant_id in PARTICIPANT_IDS:
+            async for page in iterator(participant_id, START_TIME, END_TIME):
+                for record in page:
+                    channel_records.setdefault(record["id"], record)
+        records += await hydrate_records(list(channel_records.values()), channel)
+    return records
+
+
+async def main():
+    with StandInCCSServer(latency=LATENCY, shared_records=2):
+        start = time.perf_counter()
+        sequential_records = await fetch_sequential()
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        records = await fan_out_records(
+            participant_ids=PARTICIPANT_IDS,
+            start_time=START_TIME,
+            end_time=END_TIME,
+            content=True,
+        )
+        concurrent = time.perf_counter() - start
+
+    print(f"渠道数: {len(CHANNEL_ITERATORS)}, 参与人数: {len(PARTICIPANT_IDS)}, 单次请求延迟: {LATENCY:.2f}s")
+    print(f"依次获取: {sequential:.2f}s, 记录数: {len(sequential_records)}")
+    print(f"并发获取: {concurrent:.2f}s, 记录数: {len(records)} (单次最慢查询约 {2 * LATENCY:.2f}s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
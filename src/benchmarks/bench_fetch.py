@@ -0,0 +1,58 @@
+"""
+CCS 记录获取并发基准测试
+
+启动本地模拟 CCS 服务器，同时发起 N 个事件的记录获取请求，
+验证各事件的请求在时间上重叠执行，而不是依次执行。
+
+运行: python -m src.benchmarks.bench_fetch
+"""
+
+import time
+import asyncio
+
+from src.records import get_call_recording
+from src.benchmarks.mock_ccs import StandInCCSServer
+
+
+N_EVENTS = 20
+LATENCY = 0.2
+
+
+async def fetch_event(participant_id: str) -> tuple[float, float]:
+    start = time.perf_counter()
+    await get_call_recording(
+        participant_ids=participant_id,
+        start_time="2026-01-19 00:00:00",
+        end_time="2026-01-19 23:59:59",
+        page=1,
+        size=100,
+        content=True,
+    )
+    return start, time.perf_counter()
+
+
+async def main():
+    with StandInCCSServer(latency=LATENCY) as server:
+        # 预热 token 和连接
+        await fetch_event("warmup")
+        server.max_in_flight = 0
+
+        start = time.perf_counter()
+        spans = await asyncio.gather(
+            *[fetch_event(f"user-{i}") for i in range(N_EVENTS)]
+        )
+        elapsed = time.perf_counter() - start
+
+    # 每个事件包含记录查询和内容查询两次往返
+    sequential = N_EVENTS * 2 * LATENCY
+    latest_start = max(span[0] for span in spans)
+    earliest_end = min(span[1] for span in spans)
+
+    print(f"事件数: {N_EVENTS}, 单次请求延迟: {LATENCY:.2f}s")
+    print(f"并发总耗时: {elapsed:.2f}s (依次执行约 {sequential:.2f}s)")
+    print(f"服务端最大并发请求数: {server.max_in_flight}")
+    print(f"所有事件时间重叠: {latest_start < earliest_end}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
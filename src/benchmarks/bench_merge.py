@@ -0,0 +1,70 @@
+"""
+记录去重基准测试
+
+对比逐条重建 ID 列表的去重方式（O(n²)）与 RecordMerger 的 ID 索引（O(n)）。
+模拟多个参与人的记录高度重叠的情况。
+
+运行: python -m src.benchmarks.bench_merge
+"""
+
+import time
+
+from src.records import RecordMerger
+
+
+N_PARTICIPANTS = 4
+OVERLAP = 0.5  # 参与人之间共有记录的比例
+LIST_MERGE_LIMIT = 10_000  # 超过该记录数时不再运行 O(n²) 的去重方式
+
+
+def make_pages(n_records: int) -> list[tuple[str, list[dict]]]:
+    per_participant = n_records // N_PARTICIPANTS
+    n_shared = int(per_participant * OVERLAP)
+    pages = []
+    for p in range(N_PARTICIPANTS):
+        records = [{"id": f"shared-{i}"} for i in range(n_shared)]
+        records += [{"id": f"user-{p}-{i}"} for i in range(per_participant - n_shared)]
+        pages.append((f"user-{p}", records))
+    return pages
+
+
+def merge_with_list(pages: list[tuple[str, list[dict]]]) -> list[dict]:
+    records = []
+    for _, page in pages:
+        for record in page:
+            if record["id"] not in [r["id"] for r in records]:
+                records.append(record)
+    return records
+
+
+def merge_with_index(pages: list[tuple[str, list[dict]]]) -> RecordMerger:
+    merger = RecordMerger()
+    for source, page in pages:
+        merger.add(page, source=source)
+    return merger
+
+
+def main():
+    for n_records in (10_000, 100_000):
+        pages = make_pages(n_records)
+
+        start = time.perf_counter()
+        merger = merge_with_index(pages)
+        index_time = time.perf_counter() - start
+
+        print(f"=== {n_records} 条记录, 去重后 {len(merger)} 条 ===")
+        print(f"ID 索引去重: {index_time * 1000:.1f} ms")
+        print(f"各来源重复数: {merger.stats()['duplicates']}")
+
+        if n_records <= LIST_MERGE_LIMIT:
+            start = time.perf_counter()
+            records = merge_with_list(pages)
+            list_time = time.perf_counter() - start
+            assert [r["id"] for r in records] == [r["id"] for r in merger.records]
+            print(f"列表去重: {list_time * 1000:.1f} ms ({list_time / index_time:.0f}x)")
+        else:
+            print("列表去重: 跳过 (O(n²), 耗时过长)")
+
+
+if __name__ == "__main__":
+    main()
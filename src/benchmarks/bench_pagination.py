@@ -0,0 +1,44 @@
+"""
+分页流式获取基准测试
+
+单个参与人的记录超过一页时，iter_call_recording 会获取所有分页，
+并在调用方处理第 N 页时预取第 N+1 页。
+
+运行: python -m src.benchmarks.bench_pagination
+"""
+
+import time
+import asyncio
+
+from src.records.call_recording import iter_call_recording
+from src.benchmarks.mock_ccs import StandInCCSServer
+
+
+RECORDS = 1050
+PAGE_SIZE = 100
+LATENCY = 0.1
+PROCESS_TIME = 0.1  # 模拟调用方处理每页（获取内容、打分）的耗时
+
+
+async def main():
+    with StandInCCSServer(latency=LATENCY, records_per_participant=RECORDS) as server:
+        start = time.perf_counter()
+        pages = 0
+        records = 0
+        async for page in iter_call_recording(
+            participant_id="user-0",
+            start_time="2026-01-19 00:00:00",
+            end_time="2026-01-19 23:59:59",
+            size=PAGE_SIZE,
+        ):
+            pages += 1
+            records += len(page)
+            await asyncio.sleep(PROCESS_TIME)
+        elapsed = time.perf_counter() - start
+
+    print(f"记录数: {records}/{RECORDS}, 分页数: {pages}, 请求数: {server.requests - 1}")
+    print(f"总耗时: {elapsed:.2f}s (无预取约 {pages * (LATENCY + PROCESS_TIME):.2f}s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
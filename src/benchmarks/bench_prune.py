@@ -0,0 +1,46 @@
+"""
+阈值剪枝基准测试
+
+不同相关性阈值下，获取内容之前按综合得分上界剪除的记录数，
+以及 CCS 请求数（含内容请求）和 Reranker 请求数。
+
+运行: python -m src.benchmarks.bench_prune
+"""
+
+import time
+import asyncio
+
+from src.score import rerank
+from src.score.score_records import Event, reconstruct_event
+from src.benchmarks.mock_ccs import StandInCCSServer
+from src.benchmarks.mock_reranker import StandInRerankerServer
+
+
+RELEVANCES = [0, 60, 70, 80]
+LATENCY = 0.05
+
+
+async def main():
+    with StandInCCSServer(latency=LATENCY, records_per_participant=300) as ccs, StandInRerankerServer(latency=LATENCY) as reranker:
+        for relevance in RELEVANCES:
+            event = Event(
+                event_name="CALL 内容",
+                event_time="2026-01-19T14:00:00",
+                internal_users=["1772917751770292225"],
+                external_users=["周子航"],
+                relevance=relevance,
+                weights={"time": 30, "user": 30, "content": 40},
+            )
+            rerank.score_cache = rerank.ScoreCache(maxsize=100_000, persistent=False)
+            ccs_requests, reranker_requests = ccs.requests, reranker.requests
+            start = time.perf_counter()
+            result = await reconstruct_event(event)
+            elapsed = time.perf_counter() - start
+            print(
+                f"阈值 {relevance}: {result['stats']}, CCS 请求数 {ccs.requests - ccs_requests}, "
+                f"Reranker 请求数 {reranker.requests - reranker_requests}, 耗时 {elapsed:.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
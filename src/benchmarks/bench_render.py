@@ -0,0 +1,61 @@
+"""
+结果输出基准测试
+
+对比每次重构结束时的输出开销：命令行模式用 rich 表格打印所有记录（原先服务模式
+也会执行），服务模式只输出一行简要统计日志。
+
+运行: python -m src.benchmarks.bench_render
+"""
+
+import io
+import time
+import asyncio
+from loguru import logger
+from rich.console import Console
+
+from src.score import rerank
+from src.score.score_records import Event, reconstruct_event
+from src.score.report import log_result, print_result
+from src.benchmarks.mock_ccs import StandInCCSServer
+from src.benchmarks.mock_reranker import StandInRerankerServer
+
+
+ROUNDS = 20
+
+
+async def main():
+    event = Event(
+        event_name="CALL 内容",
+        event_time="2026-01-19T14:00:00",
+        internal_users=["1772917751770292225"],
+        external_users=["韩梅梅", "周子航"],
+        relevance=50,
+        weights={"time": 30, "user": 30, "content": 40},
+    )
+
+    with StandInCCSServer(latency=0, records_per_participant=300), StandInRerankerServer(latency=0):
+        rerank.score_cache = rerank.ScoreCache(maxsize=100_000, persistent=False)
+        result = await reconstruct_event(event)
+
+    # 输出到内存，只计算渲染和格式化的开销，不含终端写入
+    console = Console(file=io.StringIO(), width=120)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        print_result(result, console=console)
+    table_elapsed = (time.perf_counter() - start) / ROUNDS
+
+    logger.remove()
+    sink = io.StringIO()
+    logger.add(sink, format="{time} | {level} | {message}")
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        log_result(result)
+    log_elapsed = (time.perf_counter() - start) / ROUNDS
+
+    print(f"记录数 {len(result['records'])}")
+    print(f"rich 表格: 每次 {table_elapsed * 1000:.1f}ms, 输出 {len(console.file.getvalue()) // ROUNDS} 字符")
+    print(f"简要日志: 每次 {log_elapsed * 1000:.2f}ms, 输出 {len(sink.getvalue()) // ROUNDS} 字符")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+"""
+Reranker 批量打分基准测试
+
+对比逐条记录调用 Reranker 与按批次并发调用的请求数和耗时，
+并验证两种方式得到的内容得分一致（按返回的 "index" 映射回原记录）；
+最后用相同的事件名称再次打分，模拟调整权重后重新调查时命中得分缓存。
+
+运行: python -m src.benchmarks.bench_rerank
+"""
+
+import time
+import asyncio
+
+from src.score import rerank
+from src.score.rerank import ScoreCache, get_rerank_scores, rerank_documents
+from src.benchmarks.mock_reranker import StandInRerankerServer
+
+
+N_RECORDS = 200
+LATENCY = 0.02
+QUERY = "230205（23 国开 205）"
+
+
+async def rerank_one_by_one(documents: list[str]) -> list[float]:
+    scores = []
+    for document in documents:
+        results = await get_rerank_scores(QUERY, [document])
+        scores.append(results[0]["relevance_score"])
+    return scores
+
+
+async def main():
+    documents = [f"记录 {i}: 讨论 23 国开 {i % 300:03d} 的报价" for i in range(N_RECORDS)]
+
+    # 使用独立的内存缓存，不受已有持久化缓存影响
+    rerank.score_cache = ScoreCache(maxsize=10_000, persistent=False)
+
+    with StandInRerankerServer(latency=LATENCY) as server:
+        start = time.perf_counter()
+        expected = await rerank_one_by_one(documents)
+        one_by_one = time.perf_counter() - start
+        one_by_one_requests = server.requests
+
+        start = time.perf_counter()
+        scores = await rerank_documents(QUERY, documents)
+        batched = time.perf_counter() - start
+        batched_requests = server.requests - one_by_one_requests
+
+        start = time.perf_counter()
+        cached_scores = await rerank_documents(QUERY, documents)
+        cached = time.perf_counter() - start
+        cached_requests = server.requests - one_by_one_requests - batched_requests
+
+    assert scores == expected == cached_scores
+    print(f"记录数: {N_RECORDS}, 单次请求延迟: {LATENCY:.2f}s")
+    print(f"逐条调用: {one_by_one_requests} 次请求, {one_by_one:.2f}s")
+    print(f"批量调用: {batched_requests} 次请求, {batched:.2f}s")
+    print(f"缓存命中: {cached_requests} 次请求, {cached * 1000:.1f}ms")
+    print(f"缓存统计: {rerank.score_cache.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
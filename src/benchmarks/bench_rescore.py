@@ -0,0 +1,54 @@
+"""
+重新打分基准测试
+
+对比重新重构事件（请求 CCS 和 Reranker）与对已保存的结果重新打分
+（只重新计算综合得分）调整权重和阈值的耗时。
+
+运行: python -m src.benchmarks.bench_rescore
+"""
+
+import time
+import asyncio
+
+from src.score import rerank
+from src.score.score_records import Event, Weights, reconstruct_event, rescore_records
+from src.benchmarks.mock_ccs import StandInCCSServer
+from src.benchmarks.mock_reranker import StandInRerankerServer
+
+
+LATENCY = 0.1
+ROUNDS = 100
+
+
+async def main():
+    event = Event(
+        event_name="CALL 内容",
+        event_time="2026-01-19T14:00:00",
+        internal_users=["1772917751770292225"],
+        external_users=["韩梅梅", "周子航"],
+        relevance=50,
+        weights={"time": 30, "user": 30, "content": 40},
+    )
+    new_weights = Weights(time=20, user=30, content=50)
+
+    with StandInCCSServer(latency=LATENCY, records_per_participant=300), StandInRerankerServer(latency=LATENCY):
+        rerank.score_cache = rerank.ScoreCache(maxsize=100_000, persistent=False)
+        result = await reconstruct_event(event)
+
+        # 重新重构时得分缓存已命中，只包含 CCS 请求和内容获取的耗时
+        start = time.perf_counter()
+        reconstructed = await reconstruct_event(event.model_copy(update={"relevance": 60, "weights": new_weights}))
+        reconstruct_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        rescored = rescore_records(result["records"], new_weights, 60)
+    rescore_elapsed = (time.perf_counter() - start) / ROUNDS
+
+    print(f"已保存记录数 {len(result['records'])}")
+    print(f"重新重构: 相关记录数 {len(reconstructed['records'])}, 耗时 {reconstruct_elapsed * 1000:.1f}ms")
+    print(f"重新打分: 相关记录数 {len(rescored)}, 耗时 {rescore_elapsed * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+"""
+LLM 风险评估并发基准测试
+
+对比原有的逐条同步调用（在事件循环线程中阻塞）与 evaluate_records_risk
+的并发评估（并发上限、超时、失败重试），并验证结果顺序与记录顺序一致。
+
+运行: python -m src.benchmarks.bench_risk
+"""
+
+import json
+import time
+import asyncio
+
+from openai import OpenAI
+
+from src.score import risk
+from src.score.risk import evaluate_records_risk
+from src.benchmarks.mock_openai import StandInOpenAIServer
+
+
+N_RECORDS = 30
+LATENCY = 0.3
+FAILURES = 3  # 并发评估时前几个请求失败，验证重试
+
+
+def evaluate_sequential(records: list[dict], base_url: str) -> list[dict]:
+    client = OpenAI(api_key="stand-in", base_url=base_url)
+    system_template = risk.PROMPT_PATH.read_text(encoding="utf-8")
+    user_template = risk.USER_PROMPT_PATH.read_text(encoding="utf-8")
+    risks = []
+    for record in records:
+        system_prompt = system_template.format(
+            records_content="\n\n---\n\n".join([r["content"] for r in records]),
+            output_format=risk.OUTPUT_FORMAT,
+        )
+        response = client.chat.completions.create(
+            model=risk.LLM_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_template.format(record_content=record["content"])},
+            ],
+        )
+        content = response.choices[0].message.content
+        risks.append(json.loads(content.replace("```json", "").replace("```", "")))
+    return risks
+
+
+class EchoServer(StandInOpenAIServer):
+    # 在风险描述中返回当前记录内容，用于验证结果顺序
+    def answer(self, messages: list[dict]) -> str:
+        prompt = messages[-1]["content"]
+        record_content = prompt.split("### 当前记录内容")[1].split("执行")[0].strip()
+        return json.dumps({"risk_level": "低", "risk_description": record_content}, ensure_ascii=False)
+
+
+async def main():
+    records = [
+        {"startTime": f"2026-01-19 09:{i:02d}:00", "channel": "CALL", "content": f"记录 {i} 的内容"}
+        for i in range(N_RECORDS)
+    ]
+
+    with EchoServer(latency=LATENCY) as server:
+        start = time.perf_counter()
+        expected = evaluate_sequential(records, f"{server.url}/v1")
+        sequential = time.perf_counter() - start
+
+        server.failures = FAILURES
+        start = time.perf_counter()
+        risks = await evaluate_records_risk(records, retry_backoff=0.1)
+        concurrent = time.perf_counter() - start
+
+    assert risks == expected
+    assert [r["risk_description"] for r in risks] == [r["content"] for r in records]
+    print(f"记录数: {N_RECORDS}, 单次请求延迟: {LATENCY:.2f}s, 并发上限: {risk.MAX_CONCURRENCY}")
+    print(f"逐条同步评估: {sequential:.2f}s")
+    print(f"并发评估: {concurrent:.2f}s (含 {FAILURES} 次失败重试), 结果顺序一致")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
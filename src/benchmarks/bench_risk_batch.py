@@ -0,0 +1,64 @@
+"""
+风险评估提示词布局与批量评估基准测试
+
+single 模式每条记录一次请求，summary 上下文在系统提示词中作为公共前缀，
+除第一个请求外都可以命中前缀缓存；batch 模式每 BATCH_SIZE 条记录一次请求，
+公共前缀只发送 n / BATCH_SIZE 次。
+
+模拟服务的延迟为 LATENCY + LATENCY_PER_RECORD * 每次请求评估的记录数。
+每种记录数依次评估 EVENT_COUNT 个事件（记录内容各不相同），报告每个事件的平均
+提示词 token 数（模拟服务用 count_tokens_batch 计数）与平均评估耗时。
+
+运行: python -m src.benchmarks.bench_risk_batch
+"""
+
+import time
+import asyncio
+
+from src.score import risk
+from src.score.risk import evaluate_records_risk
+from src.benchmarks.mock_openai import StandInOpenAIServer
+from src.benchmarks.bench_risk_context import make_records
+
+
+RECORD_COUNTS = [50, 200]
+EVENT_COUNT = 3
+LATENCY = 0.2
+LATENCY_PER_RECORD = 0.05
+MODES = ["single", "batch"]
+
+
+async def main():
+    print(
+        f"上下文模式: summary, 并发上限: {risk.MAX_CONCURRENCY}, batch 大小: {risk.BATCH_SIZE}, "
+        f"单次请求延迟: {LATENCY}s + {LATENCY_PER_RECORD}s/条"
+    )
+    print(
+        f"{'记录数':>6} {'模式':>8} {'请求数/事件':>10} {'tokens/事件':>12} "
+        f"{'前缀缓存命中':>12} {'耗时/事件':>10}"
+    )
+
+    for n in RECORD_COUNTS:
+        events = [
+            [
+                {**record, "id": f"record-{i}", "content": f"事件 {e} {record['content']}"}
+                for i, record in enumerate(make_records(n))
+            ]
+            for e in range(EVENT_COUNT)
+        ]
+        for mode in MODES:
+            with StandInOpenAIServer(latency=LATENCY, latency_per_record=LATENCY_PER_RECORD) as server:
+                start = time.perf_counter()
+                for records in events:
+                    risks = await evaluate_records_risk(records, context_mode="summary", evaluation_mode=mode)
+                    assert len(risks) == n and all(r["risk_level"] == "低" for r in risks)
+                elapsed = time.perf_counter() - start
+
+            print(
+                f"{n:>6} {mode:>8} {server.requests / EVENT_COUNT:>10.0f} {server.prompt_tokens / EVENT_COUNT:>12,.0f} "
+                f"{server.cached_prompt_tokens / server.prompt_tokens:>12.0%} {elapsed / EVENT_COUNT:>9.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
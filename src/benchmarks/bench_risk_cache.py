@@ -0,0 +1,48 @@
+"""
+风险评估结果缓存基准测试
+
+同一批记录重复评估时，缓存命中的记录不再请求 LLM；修改缓存版本
+（或提示词文件）后已有结果失效，重新评估。
+
+运行: python -m src.benchmarks.bench_risk_cache
+"""
+
+import time
+import asyncio
+
+from src.score import risk
+from src.score.risk import evaluate_records_risk
+from src.utils.cache import SqliteCache
+from src.benchmarks.mock_openai import StandInOpenAIServer
+from src.benchmarks.bench_risk_context import make_records
+
+
+N_RECORDS = 100
+LATENCY = 0.2
+
+
+async def main():
+    records = [{**record, "id": f"record-{i}"} for i, record in enumerate(make_records(N_RECORDS))]
+
+    with StandInOpenAIServer(latency=LATENCY) as server:
+        # 使用独立的缓存文件，不影响正式的风险评估缓存
+        risk.CACHE_ENABLED = True
+        risk.risk_cache = SqliteCache("bench_risk")
+        risk.risk_cache.clear()
+
+        for label in ("缓存冷启动", "缓存命中", "缓存版本变更"):
+            if label == "缓存版本变更":
+                risk.CACHE_VERSION += 1
+            requests, prompt_chars = server.requests, server.prompt_chars
+            start = time.perf_counter()
+            await evaluate_records_risk(records)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{label}: 耗时 {elapsed:.2f}s, LLM 请求数 {server.requests - requests}, "
+                f"提示词字符 {server.prompt_chars - prompt_chars:,}"
+            )
+        print(f"缓存统计: {risk.risk_cache.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
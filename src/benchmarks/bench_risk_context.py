@@ -0,0 +1,54 @@
+"""
+风险评估提示词长度基准测试
+
+原有方式（full）每条记录的提示词都包含所有记录内容，一个事件的提示词总长度
+随记录数平方增长；summary / window 模式的参考记录上下文不超过 token 预算，
+提示词总长度随记录数线性增长。
+
+运行: python -m src.benchmarks.bench_risk_context
+"""
+
+import asyncio
+
+from src.score import risk
+from src.score.risk import evaluate_records_risk
+from src.benchmarks.mock_openai import StandInOpenAIServer
+
+
+RECORD_COUNTS = [10, 50, 200]
+CONTENT_CHARS = 500  # 每条记录的内容长度
+MODES = ["full", "summary", "window"]
+
+
+def make_records(n: int) -> list[dict]:
+    return [
+        {
+            "startTime": f"2026-01-19 {9 + i // 60:02d}:{i % 60:02d}:00",
+            "channel": "CALL",
+            "content": f"记录 {i} " + "内容" * (CONTENT_CHARS // 2),
+        }
+        for i in range(n)
+    ]
+
+
+async def main():
+    print(f"每条记录 {CONTENT_CHARS} 字，上下文预算 {risk.CONTEXT_TOKEN_BUDGET} tokens")
+    print(f"{'记录数':>6} " + " ".join(f"{mode + ' 总字符':>16} {'最长':>8}" for mode in MODES))
+
+    with StandInOpenAIServer(latency=0) as server:
+        for n in RECORD_COUNTS:
+            records = make_records(n)
+            row = []
+            for mode in MODES:
+                server.prompt_chars = 0
+                await evaluate_records_risk(records, max_concurrency=16, context_mode=mode)
+                longest = max(
+                    len(risk.build_records_context(i, records, mode, risk.CONTEXT_TOKEN_BUDGET))
+                    for i in range(n)
+                )
+                row.append(f"{server.prompt_chars:>16,} {longest:>8,}")
+            print(f"{n:>6} " + " ".join(row))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+"""
+时间、用户得分向量化计算基准测试
+
+对比逐条调用 calculate_total_score 与批量调用 calculate_total_scores
+计算 100k 条记录综合得分的耗时，并验证两者结果完全相同。
+
+运行: python -m src.benchmarks.bench_scoring
+"""
+
+import time
+import random
+from datetime import datetime, timedelta
+
+from src.score.score_records import Event, calculate_total_score, calculate_total_scores
+
+
+N_RECORDS = 100_000
+
+
+def make_records(n: int) -> list[dict]:
+    random.seed(0)
+    day = datetime(2026, 1, 19)
+    channels = {
+        "CALL": {},
+        "EMAIL": {"otherUserName": "韩梅梅"},
+        "QTRADE": {"receiver": "周子航"},
+        "IDEAL": {"toName": "李雷"},
+    }
+    records = []
+    for i in range(n):
+        channel = random.choice(list(channels))
+        start = day + timedelta(seconds=random.randrange(86400))
+        separator = "T" if i % 2 else " "
+        record = {
+            "id": f"{channel}-{i}",
+            "channel": channel,
+            "userId": random.choice(["1772917751770292225", "zhangxuesong"]),
+            "startTime": start.isoformat(sep=separator),
+            **channels[channel],
+        }
+        # 部分记录没有结束时间
+        if i % 3:
+            record["endTime"] = (start + timedelta(seconds=random.randrange(3600))).isoformat(sep=separator)
+        records.append(record)
+    return records
+
+
+def main():
+    event = Event(
+        event_name="230205（23 国开 205）",
+        event_time="2026-01-19T14:00:00",
+        internal_users=["1772917751770292225"],
+        external_users=["韩梅梅", "周子航"],
+        relevance=0,
+        weights={"time": 30, "user": 30, "content": 40},
+    )
+    records = make_records(N_RECORDS)
+    content_scores = [random.random() * 100 for _ in records]
+
+    start = time.perf_counter()
+    expected = [
+        calculate_total_score(event, record, content_score)
+        for record, content_score in zip(records, content_scores)
+    ]
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = calculate_total_scores(event, records, content_scores)
+    vectorized = time.perf_counter() - start
+
+    assert scores == expected
+    print(f"记录数: {N_RECORDS:,}, 结果完全相同")
+    print(f"逐条计算: {scalar:.2f}s")
+    print(f"向量化计算: {vectorized:.2f}s ({scalar / vectorized:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
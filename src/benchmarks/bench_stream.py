@@ -0,0 +1,63 @@
+"""
+流式重构基准测试
+
+对比 /reconstruct（等待全部记录获取、打分、风险评估和保存后一次返回）与
+/reconstruct/stream（每条记录打分后立即返回）的首条记录到达时间。
+
+运行: python -m src.benchmarks.bench_stream
+"""
+
+import time
+import asyncio
+
+from src.score import rerank
+from src.score.score_records import Event, reconstruct_events
+from src.benchmarks.mock_ccs import StandInCCSServer
+from src.benchmarks.mock_reranker import StandInRerankerServer
+from src.benchmarks.mock_openai import StandInOpenAIServer
+
+
+LATENCY = 0.1
+
+
+async def main():
+    event = Event(
+        event_name="CALL 内容",
+        event_time="2026-01-19T14:00:00",
+        internal_users=["1772917751770292225"],
+        external_users=["韩梅梅", "周子航"],
+        relevance=60,
+        weights={"time": 30, "user": 30, "content": 40},
+        ai_check_record=True,
+    )
+
+    with (
+        StandInCCSServer(latency=LATENCY, records_per_participant=300),
+        StandInRerankerServer(latency=LATENCY),
+        StandInOpenAIServer(latency=LATENCY),
+    ):
+        rerank.score_cache = rerank.ScoreCache(maxsize=100_000, persistent=False)
+        arrivals = {}
+        start = time.perf_counter()
+
+        def on_frame(kind: str):
+            arrivals.setdefault(kind, time.perf_counter() - start)
+            arrivals[f"{kind}_count"] = arrivals.get(f"{kind}_count", 0) + 1
+
+        results = await reconstruct_events(
+            [event],
+            on_record=lambda _, record: on_frame("record"),
+            on_risk=lambda _, risk: on_frame("risk"),
+        )
+        elapsed = time.perf_counter() - start
+
+    print(f"相关记录数 {len(results[0]['records'])}, 风险评估数 {arrivals.get('risk_count', 0)}")
+    print(f"一次返回: 首条记录 {elapsed:.2f}s")
+    print(
+        f"流式返回: 首条记录 {arrivals['record']:.2f}s, 首条风险评估 {arrivals['risk']:.2f}s, "
+        f"完成 {elapsed:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
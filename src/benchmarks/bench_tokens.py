@@ -0,0 +1,63 @@
+"""
+本地 token 计数基准测试
+
+对比逐条请求远程 COUNT_TOKENS 接口与本地分词器批量计数的耗时，
+以及本地计数结果按内容摘要缓存后重复计数的耗时。
+
+需要在 config.toml 的 [TOKENIZER] 中配置本地 tokenizer.json。
+
+运行: python -m src.benchmarks.bench_tokens
+"""
+
+import time
+import asyncio
+
+from src.records import content
+from src.utils import tokens
+from src.benchmarks.mock_server import StandInServer
+
+
+N_TEXTS = 2000
+LATENCY = 0.01
+
+
+class StandInCountTokensServer(StandInServer):
+    def handle(self, path: str, query: dict, body: dict | None) -> dict:
+        return {"ok": True, "tokens_length": len(body["query"])}
+
+
+async def main():
+    if not tokens.has_tokenizer():
+        print("未配置本地分词器，跳过")
+        return
+
+    texts = [f"记录 {i} 的内容：" + "合约报价相关沟通。" * 50 for i in range(N_TEXTS)]
+
+    with StandInCountTokensServer(latency=LATENCY) as server:
+        saved = content.COUNT_TOKENS_API_BASE_URL, content.has_tokenizer
+        content.COUNT_TOKENS_API_BASE_URL = server.url
+        content.has_tokenizer = lambda: False
+        try:
+            start = time.perf_counter()
+            for text in texts:
+                await content.get_token_count(text)
+            remote = time.perf_counter() - start
+        finally:
+            content.COUNT_TOKENS_API_BASE_URL, content.has_tokenizer = saved
+
+    start = time.perf_counter()
+    counts = tokens.count_tokens_batch(texts)
+    local = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assert tokens.count_tokens_batch(texts) == counts
+    cached = time.perf_counter() - start
+
+    print(f"文本数: {N_TEXTS}, 平均 token 数: {sum(counts) / N_TEXTS:.0f}")
+    print(f"远程逐条计数 (延迟 {LATENCY}s): {remote:.2f}s, 请求数 {server.requests}")
+    print(f"本地批量计数: {local:.3f}s")
+    print(f"本地批量计数（缓存命中）: {cached:.3f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
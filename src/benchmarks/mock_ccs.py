@@ -0,0 +1,130 @@
+import tempfile
+from pathlib import Path
+
+from src.utils.config import load_config
+from src.benchmarks.mock_server import StandInServer
+
+
+config = load_config()
+END_POINTS = {
+    config["CCS_SERVER"]["CALL_RECORDING_END_POINT"]: "CALL",
+    config["CCS_SERVER"]["EMAIL_END_POINT"]: "EMAIL",
+    config["CCS_SERVER"]["QTRADE_END_POINT"]: "QTRADE",
+    config["CCS_SERVER"]["IDEAL_END_POINT"]: "IDEAL",
+    config["CCS_SERVER"]["TRADING_RECORDING_END_POINT"]: "TRADING",
+}
+CONTENT_END_POINT = config["CCS_SERVER"]["CONTENT_END_POINT"]
+
+
+def make_record(channel: str, record_id: str, participant_id: str, index: int) -> dict:
+    """
+    生成一条模拟记录，字段与 CCS 接口返回的记录一致。
+    """
+
+    hour, minute = divmod(index * 7 % (24 * 60), 60)
+    record = {
+        "id": record_id,
+        "userId": participant_id,
+        "startTime": f"2026-01-19 {hour:02d}:{minute:02d}:00",
+        "endTime": f"2026-01-19 {hour:02d}:{minute:02d}:30",
+    }
+    if channel == "EMAIL":
+        record["otherUserName"] = "韩梅梅"
+    elif channel == "QTRADE":
+        record["receiver"] = "周子航"
+    elif channel == "IDEAL":
+        record["toName"] = "韩梅梅"
+    return record
+
+
+class StandInCCSServer(StandInServer):
+    """
+    本地模拟 CCS 服务器，用于基准测试。
+
+    提供 token、记录列表（支持分页、按开始时间过滤）和内容接口，进入上下文时将 CCS 地址指向本服务。
+
+    Args:
+        latency (float): 每个请求的模拟延迟（秒）。
+        records_per_participant (int): 每个参与人在每个渠道的记录数。
+        shared_records (int): 所有参与人共有的记录数（用于验证去重）。
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.2,
+        records_per_participant: int = 5,
+        shared_records: int = 0,
+    ):
+        super().__init__(latency)
+        self.records_per_participant = records_per_participant
+        self.shared_records = shared_records
+
+    def records(self, channel: str, participant_id: str) -> list[dict]:
+        records = [
+            make_record(channel, f"{channel}-{participant_id}-{i}", participant_id, i)
+            for i in range(self.records_per_participant)
+        ]
+        records += [
+            make_record(channel, f"{channel}-shared-{i}", participant_id, i)
+            for i in range(self.shared_records)
+        ]
+        return records
+
+    def handle(self, path: str, query: dict, body: dict | None) -> dict:
+        if path == "/oauth2/access-token":
+            return {"message": "success", "data": "stand-in-token"}
+
+        if path == CONTENT_END_POINT:
+            return {
+                "message": "success",
+                "data": [
+                    {"recordId": record_id, "content": f"{record_id} 的内容"}
+                    for record_id in query.get("recordIds", [])
+                ],
+            }
+
+        channel = END_POINTS[path]
+        records = self.records(channel, query["participantId"][0])
+        # 按记录开始时间过滤
+        if "startTime" in query and "endTime" in query:
+            records = [
+                record
+                for record in records
+                if query["startTime"][0] <= record["startTime"] <= query["endTime"][0]
+            ]
+        page = int(query.get("page", ["1"])[0])
+        size = int(query.get("size", ["10"])[0])
+        return {
+            "message": "success",
+            "data": {
+                "records": records[(page - 1) * size : page * size],
+                "total": len(records),
+                "current": page,
+                "size": size,
+            },
+        }
+
+    def __enter__(self):
+        from src.records import auth, client, content
+        from src.results import ResultStore
+        from src.score import score_records
+
+        self.start()
+        self._saved = (auth.API_BASE_URL, client.API_BASE_URL, content.CACHE_ENABLED, score_records.result_store)
+        auth.API_BASE_URL = client.API_BASE_URL = self.url
+        auth.token_cache.clear()
+        # 基准测试默认不使用本地内容缓存，保证每次都经过网络
+        content.CACHE_ENABLED = False
+        # 重构结果保存到临时目录，不写入 src/output，也不触发其保留策略
+        self._output_dir = tempfile.TemporaryDirectory()
+        score_records.result_store = ResultStore(Path(self._output_dir.name))
+        return self
+
+    def __exit__(self, *exc):
+        from src.records import auth, client, content
+        from src.score import score_records
+
+        auth.API_BASE_URL, client.API_BASE_URL, content.CACHE_ENABLED, score_records.result_store = self._saved
+        auth.token_cache.clear()
+        self._output_dir.cleanup()
+        self.stop()
@@ -0,0 +1,119 @@
+import re
+import json
+import time
+
+from openai import AsyncOpenAI
+
+from src.utils.tokens import count_tokens_batch
+from src.benchmarks.mock_server import StandInServer
+
+
+class StandInOpenAIServer(StandInServer):
+    """
+    本地模拟 OpenAI 兼容的 Chat Completions 服务，用于基准测试。
+
+    返回固定的风险评估 JSON（批量评估时返回 JSON 数组），并统计请求中的提示词字符数与 token 数。
+    系统提示词与之前的请求相同时，视为命中前缀缓存，计入 cached_prompt_chars 与 cached_prompt_tokens。
+    进入上下文时将风险评估使用的 LLM 客户端指向本服务，并关闭本地风险评估缓存。
+
+    Args:
+        latency (float): 每个请求的模拟延迟（秒）。
+        failures (int): 前 failures 个请求返回 503，用于验证重试。
+        latency_per_record (float): 每条待评估记录增加的延迟（秒），模拟生成回复的耗时。
+    """
+
+    def __init__(self, latency: float = 0.5, failures: int = 0, latency_per_record: float = 0.0):
+        super().__init__(latency)
+        self.failures = failures
+        self.latency_per_record = latency_per_record
+        self.prompt_chars = 0
+        self.cached_prompt_chars = 0
+        self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
+        self._prefixes = set()
+
+    @staticmethod
+    def record_ids(messages: list[dict]) -> list[str]:
+        return re.findall(r"^#### 记录 (.+)$", messages[-1]["content"], flags=re.MULTILINE)
+
+    def answer(self, messages: list[dict]) -> str:
+        risk = {"risk_level": "低", "risk_description": "未发现风险"}
+        record_ids = self.record_ids(messages)
+        if record_ids:
+            return json.dumps([{"record_id": record_id, **risk} for record_id in record_ids], ensure_ascii=False)
+        return "```json\n" + json.dumps(risk, ensure_ascii=False) + "\n```"
+
+    def delay(self, path: str, query: dict, body: dict | None) -> float:
+        return self.latency + self.latency_per_record * max(len(self.record_ids(body["messages"])), 1)
+
+    def handle(self, path: str, query: dict, body: dict | None) -> dict:
+        messages = body["messages"]
+        prompt_chars = sum(len(message["content"]) for message in messages)
+        message_tokens = count_tokens_batch([message["content"] for message in messages])
+        prompt_tokens = sum(message_tokens)
+        with self._lock:
+            cached = messages[0]["content"] in self._prefixes
+            cached_chars = len(messages[0]["content"]) if cached else 0
+            cached_tokens = message_tokens[0] if cached else 0
+            self.prompt_chars += prompt_chars
+            self.cached_prompt_chars += cached_chars
+            self.prompt_tokens += prompt_tokens
+            self.cached_prompt_tokens += cached_tokens
+            self._prefixes.add(messages[0]["content"])
+        content = self.answer(messages)
+        completion_tokens = count_tokens_batch([content])[0]
+        return {
+            "id": "chatcmpl-stand-in",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens},
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def _make_handler(self):
+        Handler = super()._make_handler()
+        server = self
+
+        class FailingHandler(Handler):
+            def _respond(self):
+                with server._lock:
+                    fail = server.failures > 0
+                    server.failures -= fail
+                if not fail:
+                    return super()._respond()
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            do_POST = _respond
+
+        return FailingHandler
+
+    def __enter__(self):
+        from src.score import risk
+
+        self.start()
+        self._saved = (risk.llm_client, risk.CACHE_ENABLED)
+        risk.llm_client = AsyncOpenAI(api_key="stand-in", base_url=f"{self.url}/v1", max_retries=0)
+        # 基准测试不读写本地风险评估缓存
+        risk.CACHE_ENABLED = False
+        return self
+
+    def __exit__(self, *exc):
+        from src.score import risk
+
+        risk.llm_client, risk.CACHE_ENABLED = self._saved
+        self.stop()
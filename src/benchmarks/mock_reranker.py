@@ -0,0 +1,46 @@
+from src.benchmarks.mock_server import StandInServer
+
+
+class StandInRerankerServer(StandInServer):
+    """
+    本地模拟 Reranker 服务，用于基准测试。
+
+    与常见 Reranker 接口一致，结果按相关性从高到低排序，通过 "index" 对应请求中的文档。
+    进入上下文时将 Reranker 地址指向本服务。
+
+    Args:
+        latency (float): 每个请求的模拟延迟（秒）。
+    """
+
+    def __init__(self, latency: float = 0.1):
+        super().__init__(latency)
+        self.documents = 0
+
+    @staticmethod
+    def score(query: str, document: str) -> float:
+        # 以文档中出现的查询字符比例作为相关性
+        chars = set(query)
+        return sum(1 for char in chars if char in document) / len(chars) if chars else 0.0
+
+    def handle(self, path: str, query: dict, body: dict | None) -> dict:
+        self.documents += len(body["documents"])
+        results = [
+            {"index": i, "relevance_score": self.score(body["query"], document)}
+            for i, document in enumerate(body["documents"])
+        ]
+        results.sort(key=lambda result: result["relevance_score"], reverse=True)
+        return {"results": results[: body.get("top_n", len(results))]}
+
+    def __enter__(self):
+        from src.score import rerank
+
+        self.start()
+        self._saved_url = rerank.RERANKER_URL
+        rerank.RERANKER_URL = f"{self.url}/v1/rerank"
+        return self
+
+    def __exit__(self, *exc):
+        from src.score import rerank
+
+        rerank.RERANKER_URL = self._saved_url
+        self.stop()
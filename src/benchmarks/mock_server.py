@@ -0,0 +1,100 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class StandInServer:
+    """
+    本地模拟 HTTP 服务的基类，用于基准测试。
+
+    每个请求都会等待 latency 秒再返回 handle 的结果（JSON），并记录请求数和
+    同时处理中的最大请求数，用于验证客户端请求是否并发执行。
+
+    Args:
+        latency (float): 每个请求的模拟延迟（秒）。
+    """
+
+    def __init__(self, latency: float = 0.2):
+        self.latency = latency
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def handle(self, path: str, query: dict, body: dict | None) -> dict:
+        raise NotImplementedError
+
+    def delay(self, path: str, query: dict, body: dict | None) -> float:
+        return self.latency
+
+    def _enter(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _exit(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                parts = urlsplit(self.path)
+                query = parse_qs(parts.query)
+
+                server._enter()
+                try:
+                    time.sleep(server.delay(parts.path, query, body))
+                    data = json.dumps(
+                        server.handle(parts.path, query, body),
+                        ensure_ascii=False,
+                    ).encode("utf-8")
+                finally:
+                    server._exit()
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = _respond
+            do_POST = _respond
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,191 @@
+import time
+import uuid
+import asyncio
+from cachetools import TTLCache
+from loguru import logger
+
+from src.utils import load_config
+from src.score.score_records import Event, reconstruct_events
+
+
+config = load_config()
+JOBS_CONFIG = config.get("JOBS", {})
+
+# 后台任务参数，可在 config.toml 的 [JOBS] 中覆盖
+WORKERS = JOBS_CONFIG.get("WORKERS", 2)  # 同时执行的任务数
+QUEUE_SIZE = JOBS_CONFIG.get("QUEUE_SIZE", 16)  # 等待执行的最大任务数，超过后拒绝提交
+TTL = JOBS_CONFIG.get("TTL", 3600)  # 已结束任务的状态和结果的保留时间（秒），从结束时起算
+MAX_JOBS = JOBS_CONFIG.get("MAX_JOBS", 1000)  # 保留的最大已结束任务数
+
+
+class Job:
+    """
+    一次事件重构任务。
+
+    status 依次为 queued -> running -> succeeded / failed / cancelled。
+
+    Args:
+        events (list[Event]): 需要重构的事件。
+    """
+
+    def __init__(self, events: list[Event]):
+        self.id = uuid.uuid4().hex
+        self.events = events
+        self.status = "queued"
+        self.progress: dict = {}
+        self.result: list[dict] | None = None
+        self.error: str | None = None
+        self.created_at = time.time()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.task: asyncio.Task | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed", "cancelled")
+
+    def to_dict(self, include_result: bool = True) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "events": [event.event_name for event in self.events],
+            "progress": self.progress,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "result": self.result if include_result else None,
+        }
+
+
+class JobManager:
+    """
+    后台执行事件重构任务：有界等待队列 + 固定数量的 worker。
+
+    等待中的任务数达到 queue_size 时 submit 抛出 asyncio.QueueFull，由调用方返回 429，
+    避免并发提交的任务在事件循环上无限堆积。已取消的等待中任务不计入。
+    等待中和执行中的任务一直保留，结束后的任务保留 ttl 秒。
+
+    Args:
+        workers (int): 同时执行的任务数。
+        queue_size (int): 等待执行的最大任务数。
+        ttl (float): 已结束任务的状态和结果的保留时间（秒）。
+        max_jobs (int): 保留的最大已结束任务数。
+    """
+
+    def __init__(
+        self,
+        workers: int = WORKERS,
+        queue_size: int = QUEUE_SIZE,
+        ttl: float = TTL,
+        max_jobs: int = MAX_JOBS,
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        # 已取消的任务仍留在队列中，直到 worker 取出后跳过，等待中的任务数单独计数
+        self.queue: asyncio.Queue[Job] = asyncio.Queue()
+        self.queued = 0
+        # 等待中和执行中的任务（数量受队列和 worker 数限制），结束后移入 finished_jobs 按结束时间过期
+        self.jobs: dict[str, Job] = {}
+        self.finished_jobs: TTLCache[str, Job] = TTLCache(maxsize=max_jobs, ttl=ttl)
+        self._worker_tasks: list[asyncio.Task] = []
+
+    async def start(self):
+        self._worker_tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    def submit(self, events: list[Event]) -> Job:
+        """
+        提交任务，立即返回。
+
+        参数:
+            events (list[Event]): 需要重构的事件。
+
+        返回:
+            Job: 新任务。等待中的任务数已达上限时抛出 asyncio.QueueFull。
+        """
+
+        if self.queued >= self.queue_size:
+            raise asyncio.QueueFull
+        job = Job(events)
+        self.queue.put_nowait(job)
+        self.queued += 1
+        self.jobs[job.id] = job
+        logger.info(f"任务 {job.id} 已提交, 等待中的任务数: {self.queued}")
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self.jobs.get(job_id) or self.finished_jobs.get(job_id)
+
+    def _finish(self, job: Job):
+        job.finished_at = time.time()
+        self.jobs.pop(job.id, None)
+        self.finished_jobs[job.id] = job
+
+    def cancel(self, job_id: str) -> Job | None:
+        """
+        取消任务：等待中的任务不再执行，执行中的任务立即停止。
+
+        参数:
+            job_id (str): 任务 ID。
+
+        返回:
+            Job | None: 任务，不存在时为 None。
+        """
+
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+
+        if job.task is not None:
+            job.task.cancel()
+        else:
+            job.status = "cancelled"
+            self._finish(job)
+            self.queued -= 1
+        return job
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queued": self.queued,
+            "running": sum(job.status == "running" for job in self.jobs.values()),
+            "jobs": len(self.jobs) + len(self.finished_jobs),
+        }
+
+    async def _work(self):
+        while True:
+            job = await self.queue.get()
+            try:
+                # 等待期间已取消的任务直接跳过（取消时已从等待数中扣除）
+                if not job.finished:
+                    self.queued -= 1
+                    await self._run(job)
+            finally:
+                self.queue.task_done()
+
+    async def _run(self, job: Job):
+        job.status = "running"
+        job.started_at = time.time()
+        job.task = asyncio.create_task(reconstruct_events(job.events, progress=job.progress))
+        try:
+            job.result = await job.task
+            job.status = "succeeded"
+        except asyncio.CancelledError:
+            # worker 自身被取消（服务关闭）时继续向上抛出
+            if asyncio.current_task().cancelling():
+                job.task.cancel()
+                raise
+            job.status = "cancelled"
+        except Exception as e:
+            logger.exception(f"任务 {job.id} 失败: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            self._finish(job)
+            logger.info(f"任务 {job.id} {job.status}, 耗时 {job.finished_at - job.started_at:.2f}s")
@@ -2,10 +2,15 @@ from .call_recording import get_call_recording
 from .email import get_email_records
 from .qtrade import get_qtrade_records
 from .ideal import get_ideal_records
+from .merge import RecordMerger
+from .fanout import fan_out_records, stream_records
 
 __all__ = [
     "get_call_recording",
     "get_email_records",
     "get_qtrade_records",
     "get_ideal_records",
+    "RecordMerger",
+    "fan_out_records",
+    "stream_records",
 ]
\ No newline at end of file
@@ -1,17 +1,18 @@
-import requests
-from cachetools import cached, TTLCache
+import asyncio
+from cachetools import TTLCache
 from src.utils.config import load_config
+from src.utils.http import get_http_client
 
 
 # Cache the token for 1 hour
 token_cache = TTLCache(maxsize=1, ttl=60 * 60)
+token_lock = asyncio.Lock()
 
 config = load_config()
 API_BASE_URL = config["CCS_SERVER"]["API_BASE_URL"]
 
 
-@cached(token_cache)
-def get_token(
+async def get_token(
     appKey: str = config["CCS_SERVER"]["APP_KEY"],
     appSecret: str = config["CCS_SERVER"]["APP_SECRET"],
 ) -> str:
@@ -26,29 +27,40 @@ def get_token(
         str: A string containing the access token.
     """
 
-    headers = {
-        "Content-Type": "application/json",
-    }
+    cache_key = (appKey, appSecret)
+    if cache_key in token_cache:
+        return token_cache[cache_key]
 
-    params = {
-        "appKey": appKey,
-        "appSecret": appSecret,
-    }
+    # 并发请求只获取一次 token
+    async with token_lock:
+        if cache_key in token_cache:
+            return token_cache[cache_key]
 
-    response = requests.post(
-        f"{API_BASE_URL}/oauth2/access-token",
-        headers=headers,
-        params=params,
-    )
+        headers = {
+            "Content-Type": "application/json",
+        }
 
-    response.raise_for_status()
+        params = {
+            "appKey": appKey,
+            "appSecret": appSecret,
+        }
 
-    if response.json()["message"] != "success":
-        raise Exception(f"get token failed: {response.json()['message']}")
+        response = await get_http_client().post(
+            f"{API_BASE_URL}/oauth2/access-token",
+            headers=headers,
+            params=params,
+        )
 
-    return response.json()["data"]
+        response.raise_for_status()
+
+        if response.json()["message"] != "success":
+            raise Exception(f"get token failed: {response.json()['message']}")
+
+        token_cache[cache_key] = response.json()["data"]
+
+    return token_cache[cache_key]
 
 
 if __name__ == "__main__":
-    token = get_token()
+    token = asyncio.run(get_token())
     print(f"TOKEN: {token}")
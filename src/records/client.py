@@ -0,0 +1,94 @@
+import asyncio
+from contextlib import AsyncExitStack
+from typing import AsyncIterator, Awaitable, Callable, Sequence
+from .auth import get_token
+from src.utils.config import load_config
+from src.utils.http import get_http_client
+
+
+config = load_config()
+API_BASE_URL = config["CCS_SERVER"]["API_BASE_URL"]
+
+
+async def ccs_get(end_point: str, params: dict, error_message: str) -> dict:
+    """
+    Send a GET request to the CCS Open API through the shared HTTP client.
+
+    Args:
+        end_point (str): API end point, e.g. CCS_SERVER["CALL_RECORDING_END_POINT"].
+        params (dict): Query parameters.
+        error_message (str): Message prefix of the exception raised when the API fails.
+
+    Returns:
+        dict: Response body of the API.
+    """
+
+    headers = {
+        "Content-Type": "application/json",
+        "access-token": await get_token(),
+    }
+    response = await get_http_client().get(
+        f"{API_BASE_URL}{end_point}",
+        headers=headers,
+        params=params,
+    )
+    response.raise_for_status()
+
+    body = response.json()
+    if body["message"] != "success":
+        raise Exception(f"{error_message}: {body['message']}")
+
+    return body
+
+
+async def iter_pages(
+    query: Callable[..., Awaitable[dict]],
+    size: int = 100,
+    semaphores: Sequence[asyncio.Semaphore] = (),
+    **kwargs,
+) -> AsyncIterator[list[dict]]:
+    """
+    Walk all pages of a CCS list query.
+
+    Page N+1 is requested while page N is being processed by the caller, and
+    the walk stops once the total count reported by the API has been reached.
+
+    Args:
+        query (Callable[..., Awaitable[dict]]): Query function taking page and size, returns page data with "records" and "total".
+        size (int, optional): Page size. Defaults to 100.
+        semaphores (Sequence[asyncio.Semaphore], optional): Semaphores held while a page is requested. Defaults to ().
+        **kwargs: Other arguments of the query function.
+
+    Yields:
+        list[dict]: Records of one page.
+    """
+
+    async def fetch(page: int) -> dict:
+        async with AsyncExitStack() as stack:
+            for semaphore in semaphores:
+                await stack.enter_async_context(semaphore)
+            return await query(page=page, size=size, **kwargs)
+
+    page = 1
+    task = asyncio.create_task(fetch(page))
+    try:
+        while task is not None:
+            data = await task
+            records = data["records"]
+
+            # 根据接口返回的总数判断是否还有下一页，没有总数时以不满一页为结束
+            total = data.get("total")
+            if total is not None:
+                has_next = page * size < int(total)
+            else:
+                has_next = len(records) == size
+
+            task = None
+            if has_next and records:
+                page += 1
+                task = asyncio.create_task(fetch(page))
+
+            yield records
+    finally:
+        if task is not None:
+            task.cancel()
@@ -1,19 +1,41 @@
 import json
-import requests
-from .auth import get_token
+import asyncio
+import weakref
+from typing import AsyncIterator
+from loguru import logger
+from .client import ccs_get
 from src.utils.config import load_config
+from src.utils.http import get_http_client
+from src.utils.cache import SqliteCache
+from src.utils.tokens import count_tokens, has_tokenizer
 
 
 config = load_config()
 
-CCS_API_BASE_URL = config["CCS_SERVER"]["API_BASE_URL"]
 CONTENT_END_POINT = config["CCS_SERVER"]["CONTENT_END_POINT"]
 
-COUNT_TOKENS_API_BASE_URL = config["COUNT_TOKENS"]["API_BASE_URL"]
-COUNT_TOKENS_END_POINT = config["COUNT_TOKENS"]["END_POINT"]
+# 内容获取参数，可在 config.toml 的 [CONTENT] 中覆盖
+CONTENT_CONFIG = config.get("CONTENT", {})
+CHUNK_SIZE = CONTENT_CONFIG.get("CHUNK_SIZE", 50)  # 每次请求的记录 ID 数，避免 URL 过长
+MAX_CONCURRENCY = CONTENT_CONFIG.get("MAX_CONCURRENCY", 4)  # 同时进行的内容请求数（所有渠道和参与人合计）
+ID_FIELD = CONTENT_CONFIG.get("ID_FIELD", "recordId")  # 内容接口返回行中的记录 ID 字段
+CACHE_ENABLED = CONTENT_CONFIG.get("CACHE_ENABLED", True)  # 是否使用本地内容缓存
+CACHE_MAX_MB = CONTENT_CONFIG.get("CACHE_MAX_MB", 512)  # 本地内容缓存大小上限（MB）
 
+# 归档后的记录内容不会再变化，缓存在本地避免重复获取
+content_cache = SqliteCache("content", max_bytes=CACHE_MAX_MB * 1024 * 1024)
 
-def get_content(
+# 每个事件循环一个信号量，所有内容请求共用同一并发上限
+_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+# 远程 token 计数接口，仅在未配置本地分词器时使用
+COUNT_TOKENS_API_BASE_URL = config.get("COUNT_TOKENS", {}).get("API_BASE_URL", "")
+COUNT_TOKENS_END_POINT = config.get("COUNT_TOKENS", {}).get("END_POINT", "")
+
+
+async def get_content(
     record_ids: list[str],
     channel: str,
 ) -> dict:
@@ -38,33 +60,205 @@ def get_content(
     if not record_ids:
         return {"data": []}
 
-    headers = {
-        "Content-Type": "application/json",
-        "access-token": get_token(),
-    }
     params = {
         "recordIds": record_ids,
         "channel": channel,
     }
-    response = requests.get(
-        f"{CCS_API_BASE_URL}{CONTENT_END_POINT}",
-        headers=headers,
-        params=params,
-    )
-    if response.status_code != 200:
-        print(response.text)
-    response.raise_for_status()
+    return await ccs_get(CONTENT_END_POINT, params, "get unify text failed")
 
-    if response.json()["message"] != "success":
-        raise Exception(f"get unify text failed: {response.json()['message']}")
 
-    return response.json()
+async def get_content_by_id(
+    record_ids: list[str],
+    channel: str,
+) -> dict[str, str]:
+    """
+    Get the content of the media records, keyed by record ID.
 
+    Rows of records that were not requested are dropped. Records without a row are
+    simply absent from the result, so callers can re-fetch only those.
 
-def get_token_count(content: str | None = None) -> int:
+    Args:
+        record_ids (list[str]): List of media record IDs.
+        channel (str): Communication channel, see get_content.
+
+    Returns:
+        dict[str, str]: Record ID (as a string, CCS may return numeric IDs) -> content.
+    """
+
+    content = await get_content(record_ids=record_ids, channel=channel)
+    rows = content["data"]
+
+    # 返回行没有记录 ID 字段时，只有行数与请求一致才按位置对应
+    if rows and all(ID_FIELD not in row for row in rows):
+        if len(rows) != len(record_ids):
+            logger.warning(
+                f"{channel} 内容缺少 {ID_FIELD} 且行数不一致: 请求 {len(record_ids)}, 返回 {len(rows)}"
+            )
+            return {}
+        return {str(record_id): row["content"] for record_id, row in zip(record_ids, rows)}
+
+    # 记录列表和内容接口返回的 ID 可能一个是数字一个是字符串，统一按字符串对应
+    requested = {str(record_id) for record_id in record_ids}
+    contents = {}
+    for row in rows:
+        record_id = str(row.get(ID_FIELD))
+        if record_id in requested:
+            contents[record_id] = row["content"]
+
+    extra = len(rows) - len(contents)
+    if extra:
+        logger.warning(f"{channel} 内容返回了 {extra} 条未请求或重复的记录")
+
+    return contents
+
+
+def cache_key(channel: str, record_id: str | int) -> str:
+    return f"{channel}:{str(record_id)}"
+
+
+def get_content_semaphore() -> asyncio.Semaphore:
+    """
+    Get the content request semaphore shared by the running event loop.
+
+    Returns:
+        asyncio.Semaphore: Semaphore limiting content requests to CONTENT["MAX_CONCURRENCY"].
+    """
+
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENCY)
+    return semaphore
+
+
+async def iter_hydrated_records(
+    records: list[dict],
+    channel: str,
+    chunk_size: int = CHUNK_SIZE,
+) -> AsyncIterator[list[dict]]:
+    """
+    Attach the content and channel to the media records, chunk by chunk.
+
+    The record IDs are split into chunks of chunk_size and the chunks are fetched
+    concurrently; all calls in the event loop share one limit of CONTENT["MAX_CONCURRENCY"]
+    requests in flight. Each chunk is yielded as soon as its content lands, so callers
+    can start scoring before the whole channel is hydrated. Content is joined by
+    record ID; records whose content is missing are re-fetched once at the end,
+    and get an empty content if it is still missing.
+
+    Content already in the local content cache (keyed by channel and record ID) is
+    yielded first without a request, only the other records go to the network.
+
+    Args:
+        records (list[dict]): List of media records.
+        channel (str): Communication channel, see get_content.
+        chunk_size (int, optional): Record IDs per request. Defaults to CONTENT["CHUNK_SIZE"].
+
+    Yields:
+        list[dict]: A chunk of media records with "content" and "channel", in completion order.
+    """
+
+    semaphore = get_content_semaphore()
+    missing: list[dict] = []
+
+    async def hydrate_chunk(chunk: list[dict]) -> list[dict]:
+        async with semaphore:
+            contents = await get_content_by_id(
+                record_ids=[record["id"] for record in chunk],
+                channel=channel,
+            )
+
+        if CACHE_ENABLED:
+            await asyncio.to_thread(
+                content_cache.set_many,
+                {
+                    cache_key(channel, record_id): value
+                    for record_id, value in contents.items()
+                    if value
+                },
+            )
+
+        hydrated = []
+        for record in chunk:
+            record_id = str(record["id"])
+            if record_id in contents:
+                hydrated.append({**record, "content": contents[record_id], "channel": channel})
+            else:
+                missing.append(record)
+        return hydrated
+
+    async def hydrate_all(records: list[dict]) -> AsyncIterator[list[dict]]:
+        tasks = [
+            asyncio.create_task(hydrate_chunk(records[i : i + chunk_size]))
+            for i in range(0, len(records), chunk_size)
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                hydrated = await task
+                if hydrated:
+                    yield hydrated
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    if CACHE_ENABLED and records:
+        cached = await asyncio.to_thread(
+            content_cache.get_many,
+            [cache_key(channel, record["id"]) for record in records],
+        )
+        if cached:
+            yield [
+                {**record, "content": cached[cache_key(channel, record["id"])], "channel": channel}
+                for record in records
+                if cache_key(channel, record["id"]) in cached
+            ]
+            records = [
+                record for record in records if cache_key(channel, record["id"]) not in cached
+            ]
+
+    async for hydrated in hydrate_all(records):
+        yield hydrated
+
+    if not missing:
+        return
+
+    # 缺失内容的记录只重新获取一次
+    logger.warning(f"{channel} 有 {len(missing)} 条记录缺少内容，重新获取")
+    retry, missing = missing, []
+    async for hydrated in hydrate_all(retry):
+        yield hydrated
+
+    if missing:
+        logger.error(f"{channel} 有 {len(missing)} 条记录重新获取后仍缺少内容: {[r['id'] for r in missing]}")
+        yield [{**record, "content": "", "channel": channel} for record in missing]
+
+
+async def hydrate_records(records: list[dict], channel: str) -> list[dict]:
+    """
+    Attach the content and channel to the media records.
+
+    Args:
+        records (list[dict]): List of media records.
+        channel (str): Communication channel, see get_content.
+
+    Returns:
+        list[dict]: List of media records with "content" and "channel", in the original order.
+    """
+
+    hydrated = {}
+    async for chunk in iter_hydrated_records(records, channel):
+        for record in chunk:
+            hydrated[record["id"]] = record
+    return [hydrated[record["id"]] for record in records]
+
+
+async def get_token_count(content: str | None = None) -> int:
     """
     Get the token count of the content.
 
+    Counted in-process with the local tokenizer. Without a local tokenizer the remote
+    COUNT_TOKENS service is used if configured, otherwise the count is estimated.
+
     Args:
         content (str): Content.
 
@@ -74,13 +268,16 @@ def get_token_count(content: str | None = None) -> int:
 
     if not content:
         return 0
-    
+
+    if has_tokenizer() or not COUNT_TOKENS_API_BASE_URL:
+        return count_tokens(content)
+
     url = f"{COUNT_TOKENS_API_BASE_URL}{COUNT_TOKENS_END_POINT}"
 
     payload = {
         "query": content,
     }
-    response = requests.post(url, json=payload)
+    response = await get_http_client().post(url, json=payload)
     response.raise_for_status()
 
     if not response.json()["ok"]:
@@ -89,7 +286,7 @@ def get_token_count(content: str | None = None) -> int:
     return response.json()["tokens_length"]
 
 
-if __name__ == "__main__":
+async def main():
     record_ids = [
         "1984397103421546498",
         "1984759491723354113",
@@ -97,8 +294,12 @@ if __name__ == "__main__":
     ]
     channel = "CALL"
 
-    content = get_content(record_ids=record_ids, channel=channel)
+    content = await get_content(record_ids=record_ids, channel=channel)
     print(json.dumps(content, ensure_ascii=False, indent=2))
 
-    token_count = get_token_count(content["data"][0]["content"])
+    token_count = await get_token_count(content["data"][0]["content"])
     print(f"Token count: {token_count}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,178 @@
+import json
+import time
+import asyncio
+from typing import AsyncIterator, Callable
+from src.utils import load_config
+from .content import iter_hydrated_records
+from .merge import RecordMerger
+from .call_recording import iter_call_recording
+from .email import iter_email_records
+from .qtrade import iter_qtrade_records
+from .ideal import iter_ideal_records
+
+
+config = load_config()
+FANOUT_CONFIG = config.get("FANOUT", {})
+
+# 并发上限，可在 config.toml 的 [FANOUT] 中覆盖
+MAX_CONCURRENCY = FANOUT_CONFIG.get("MAX_CONCURRENCY", 16)  # 全局同时进行的查询数
+MAX_CONCURRENCY_PER_CHANNEL = FANOUT_CONFIG.get("MAX_CONCURRENCY_PER_CHANNEL", 4)  # 单个渠道同时进行的查询数
+PAGE_SIZE = FANOUT_CONFIG.get("PAGE_SIZE", 100)  # 每页记录数
+STREAM_BUFFER = FANOUT_CONFIG.get("STREAM_BUFFER", 8)  # 等待消费的最大批次数，超过后暂停获取
+
+# 渠道 -> 单个参与人的分页迭代函数
+CHANNEL_ITERATORS = {
+    "CALL": iter_call_recording,
+    "EMAIL": iter_email_records,
+    "QTRADE": iter_qtrade_records,
+    "IDEAL": iter_ideal_records,
+}
+
+
+async def stream_records(
+    participant_ids: list[str],
+    start_time: str,
+    end_time: str,
+    size: int = PAGE_SIZE,
+    channels: list[str] | None = None,
+    content: bool = False,
+    max_concurrency: int = MAX_CONCURRENCY,
+    max_concurrency_per_channel: int = MAX_CONCURRENCY_PER_CHANNEL,
+    mergers: dict[str, RecordMerger] | None = None,
+    select: Callable[[list[dict]], list[dict]] | None = None,
+) -> AsyncIterator[list[dict]]:
+    """
+    Walk all pages of every (channel x participant) combination concurrently.
+
+    Each page is de-duplicated within its channel, hydrated with content in chunks and
+    each chunk is yielded as soon as it arrives. At most STREAM_BUFFER batches wait for the consumer, so
+    memory stays bounded however wide the time window is.
+
+    Args:
+        participant_ids (list[str], mandatory): Participant IDs.
+        start_time (str, mandatory): Start time, format "2025-10-01 00:00:00".
+        end_time (str, mandatory): End time, format "2025-10-31 23:59:59".
+        size (int, optional): Page size. Defaults to FANOUT["PAGE_SIZE"].
+        channels (list[str] | None, optional): Channels to query. Defaults to all of CHANNEL_ITERATORS.
+        content (bool, optional): Whether to get content. Defaults to False.
+        max_concurrency (int, optional): Max concurrent queries in total. Defaults to FANOUT["MAX_CONCURRENCY"].
+        max_concurrency_per_channel (int, optional): Max concurrent queries per channel. Defaults to FANOUT["MAX_CONCURRENCY_PER_CHANNEL"].
+        mergers (dict[str, RecordMerger] | None, optional): Filled with the ID index of each channel,
+            pass a dict to read the duplicate statistics afterwards. Defaults to None.
+        select (Callable[[list[dict]], list[dict]] | None, optional): Called with each de-duplicated
+            page (records with "channel") before hydration; only the records it returns are hydrated
+            and yielded. Defaults to None.
+
+    Yields:
+        list[dict]: A batch of new records with "channel" (and "content").
+    """
+
+    channels = channels or list(CHANNEL_ITERATORS)
+    global_semaphore = asyncio.Semaphore(max_concurrency)
+    queue: asyncio.Queue[list[dict] | None] = asyncio.Queue(maxsize=STREAM_BUFFER)
+    mergers = {} if mergers is None else mergers
+    for channel in channels:
+        mergers[channel] = RecordMerger(keep_records=False)
+
+    async def produce(channel: str, semaphore: asyncio.Semaphore, participant_id: str):
+        async for records in CHANNEL_ITERATORS[channel](
+            participant_id=participant_id,
+            start_time=start_time,
+            end_time=end_time,
+            size=size,
+            semaphores=(semaphore, global_semaphore),
+        ):
+            records = mergers[channel].add(records, source=participant_id)
+            if select is not None:
+                # 在获取内容之前筛选，被排除的记录不获取内容
+                records = select([{**record, "channel": channel} for record in records])
+            if not records:
+                continue
+
+            if content:
+                # 每个内容分块获取后立即交给调用方打分
+                async for chunk in iter_hydrated_records(records, channel):
+                    await queue.put(chunk)
+            else:
+                await queue.put([{**record, "channel": channel} for record in records])
+
+    async def run():
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for channel in channels:
+                    semaphore = asyncio.Semaphore(max_concurrency_per_channel)
+                    for participant_id in participant_ids:
+                        task_group.create_task(produce(channel, semaphore, participant_id))
+        except BaseExceptionGroup as e:
+            await queue.put(None)
+            raise e.exceptions[0]
+        await queue.put(None)
+
+    runner = asyncio.create_task(run())
+    try:
+        while (records := await queue.get()) is not None:
+            yield records
+        await runner
+    finally:
+        runner.cancel()
+
+
+async def fan_out_records(
+    participant_ids: list[str],
+    start_time: str,
+    end_time: str,
+    size: int = PAGE_SIZE,
+    channels: list[str] | None = None,
+    content: bool = False,
+    max_concurrency: int = MAX_CONCURRENCY,
+    max_concurrency_per_channel: int = MAX_CONCURRENCY_PER_CHANNEL,
+) -> list[dict]:
+    """
+    Get all records of every (channel x participant) combination concurrently.
+
+    Args:
+        See stream_records.
+
+    Returns:
+        list[dict]: Records of all channels, in the order of channels.
+    """
+
+    channels = channels or list(CHANNEL_ITERATORS)
+    channel_records = {channel: [] for channel in channels}
+    async for records in stream_records(
+        participant_ids=participant_ids,
+        start_time=start_time,
+        end_time=end_time,
+        size=size,
+        channels=channels,
+        content=content,
+        max_concurrency=max_concurrency,
+        max_concurrency_per_channel=max_concurrency_per_channel,
+    ):
+        channel_records[records[0]["channel"]] += records
+
+    return [record for records in channel_records.values() for record in records]
+
+
+async def main():
+    USER_HUANGJ = "1772917751770292225" # 黄金
+    USER_ZHANGXS = "zhangxuesong"  # 张雪松
+
+    records = await fan_out_records(
+        participant_ids=[USER_HUANGJ, USER_ZHANGXS],
+        start_time="2026-01-19 00:00:00",
+        end_time="2026-01-19 23:59:59",
+        content=True,
+    )
+    print(
+        "=== All Channel Records ===\n",
+        json.dumps(records, ensure_ascii=False, indent=2),
+    )
+    print(f"[OK] 所有渠道记录数: {len(records)}")
+
+
+if __name__ == "__main__":
+    start_time = time.time()
+    asyncio.run(main())
+    end_time = time.time()
+    print(f"[OK] 所有渠道记录获取耗时: {end_time - start_time:.2f} seconds")
@@ -0,0 +1,73 @@
+from collections import Counter
+
+
+class RecordMerger:
+    """
+    Merge records from several sources and de-duplicate them by record ID.
+
+    Records are kept in an insertion-ordered index (dict), so merging n records
+    costs O(n) instead of rebuilding the ID list for every incoming record.
+
+    Args:
+        keep_records (bool, optional): Whether to keep the merged records. When False only
+            the IDs are kept, which is enough for de-duplicating a stream. Defaults to True.
+    """
+
+    def __init__(self, keep_records: bool = True):
+        self.keep_records = keep_records
+        self.index: dict[str, dict | None] = {}
+        self.received: Counter[str] = Counter()  # 每个来源收到的记录数
+        self.duplicates: Counter[str] = Counter()  # 每个来源重复的记录数
+
+    def add(self, records: list[dict], source: str = "") -> list[dict]:
+        """
+        Add records of a source to the index.
+
+        Args:
+            records (list[dict]): Records to add, each with an "id".
+            source (str, optional): Source of the records, e.g. the participant ID. Defaults to "".
+
+        Returns:
+            list[dict]: Records that were not in the index yet, in their original order.
+        """
+
+        new_records = []
+        for record in records:
+            if record["id"] in self.index:
+                self.duplicates[source] += 1
+                continue
+            self.index[record["id"]] = record if self.keep_records else None
+            new_records.append(record)
+
+        self.received[source] += len(records)
+        return new_records
+
+    @property
+    def records(self) -> list[dict]:
+        """
+        Merged records in insertion order.
+        """
+
+        if not self.keep_records:
+            raise ValueError("records are not kept, set keep_records=True")
+        return list(self.index.values())
+
+    def stats(self) -> dict:
+        """
+        Merge statistics.
+
+        Returns:
+            dict: {"unique": 10, "received": {"source": 12}, "duplicates": {"source": 2}}.
+        """
+
+        return {
+            "unique": len(self.index),
+            "received": dict(self.received),
+            "duplicates": dict(self.duplicates),
+        }
+
+    def __contains__(self, record_id: str) -> bool:
+        return record_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
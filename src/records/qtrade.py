@@ -1,34 +1,33 @@
 import json
 import time
-import requests
 import asyncio
+from typing import AsyncIterator
 # from loguru import logger
-from .auth import get_token
+from .client import ccs_get, iter_pages
 from src.utils import load_config
-from .content import get_content
+from .content import hydrate_records
+from .merge import RecordMerger
 
 
 config = load_config()
-API_BASE_URL = config["CCS_SERVER"]["API_BASE_URL"]
 END_POINT = config["CCS_SERVER"]["QTRADE_END_POINT"]
 CHANNEL = "QTRADE"
 
 
-async def get_qtrade_records(
-    participant_ids: str,
+async def query_qtrade_records(
+    participant_id: str,
     start_time: str,
     end_time: str,
     page: int = 1,
     size: int = 10,
     extension: str | None = None,
     communication_type: str | None = None,  # 通信类型（internal/external/unknown）
-    content: bool = False,
-) -> list[dict]:
+) -> dict:
     """
-    Get the QTrade records.
+    Query one page of the QTrade records of a participant.
 
     Args:
-        participant_ids (str, mandatory): Comma-separated participant IDs.
+        participant_id (str, mandatory): Participant ID.
         start_time (str, mandatory): Start time, format "2025-10-01 00:00:00".
         end_time (str, mandatory): End time, format "2025-10-31 23:59:59".
         page (int, optional): Page number. Defaults to 1.
@@ -37,14 +36,11 @@ async def get_qtrade_records(
         communication_type (str | None, optional): Communication type. Defaults to None.
 
     Returns:
-        list[dict]: List of QTrade records.
+        dict: Page data, contains "records" and "total".
     """
 
-    headers = {
-        "Content-Type": "application/json",
-        "access-token": get_token(),
-    }
     params = {
+        "participantId": participant_id,
         "startTime": start_time,
         "endTime": end_time,
         "page": page,
@@ -55,34 +51,96 @@ async def get_qtrade_records(
     if communication_type:
         params["communicationType"] = communication_type
 
-    records = []
-    for participant_id in participant_ids.split(","):
-        params["participantId"] = participant_id
-        response = requests.get(
-            f"{API_BASE_URL}{END_POINT}",
-            headers=headers,
-            params=params,
-        )
-        response.raise_for_status()
+    response = await ccs_get(END_POINT, params, "get call cdr records failed")
+    return response["data"]
 
-        if response.json()["message"] != "success":
-            raise Exception(f"get call cdr records failed: {response.json()['message']}")
 
-        for record in response.json()["data"]["records"]:
-            if record["id"] not in [r["id"] for r in records]:
-                records.append(record)
+async def iter_qtrade_records(
+    participant_id: str,
+    start_time: str,
+    end_time: str,
+    size: int = 100,
+    extension: str | None = None,
+    communication_type: str | None = None,  # 通信类型（internal/external/unknown）
+    semaphores: tuple[asyncio.Semaphore, ...] = (),
+) -> AsyncIterator[list[dict]]:
+    """
+    Walk all pages of the QTrade records of a participant.
 
-    if content:
-        record_ids = [record["id"] for record in records]
-        content = get_content(record_ids=record_ids, channel=CHANNEL)
-        records = [
-            {
-                **record,
-                "content": content["data"][i]["content"],
-                "channel": CHANNEL,
-            }
-            for i, record in enumerate(records)
+    Args:
+        participant_id (str, mandatory): Participant ID.
+        start_time (str, mandatory): Start time, format "2025-10-01 00:00:00".
+        end_time (str, mandatory): End time, format "2025-10-31 23:59:59".
+        size (int, optional): Page size. Defaults to 100.
+        extension (str | None, optional): Extension number. Defaults to None.
+        communication_type (str | None, optional): Communication type. Defaults to None.
+        semaphores (tuple[asyncio.Semaphore, ...], optional): Semaphores held while a page is requested. Defaults to ().
+
+    Yields:
+        list[dict]: QTrade records of one page.
+    """
+
+    async for records in iter_pages(
+        query_qtrade_records,
+        size=size,
+        semaphores=semaphores,
+        participant_id=participant_id,
+        start_time=start_time,
+        end_time=end_time,
+        extension=extension,
+        communication_type=communication_type,
+    ):
+        yield records
+
+
+async def get_qtrade_records(
+    participant_ids: str,
+    start_time: str,
+    end_time: str,
+    page: int = 1,
+    size: int = 10,
+    extension: str | None = None,
+    communication_type: str | None = None,  # 通信类型（internal/external/unknown）
+    content: bool = False,
+) -> list[dict]:
+    """
+    Get the QTrade records.
+
+    Args:
+        participant_ids (str, mandatory): Comma-separated participant IDs.
+        start_time (str, mandatory): Start time, format "2025-10-01 00:00:00".
+        end_time (str, mandatory): End time, format "2025-10-31 23:59:59".
+        page (int, optional): Page number. Defaults to 1.
+        size (int, optional): Page size. Defaults to 10.
+        extension (str | None, optional): Extension number. Defaults to None.
+        communication_type (str | None, optional): Communication type. Defaults to None.
+
+    Returns:
+        list[dict]: List of QTrade records.
+    """
+
+    pages = await asyncio.gather(
+        *[
+            query_qtrade_records(
+                participant_id=participant_id,
+                start_time=start_time,
+                end_time=end_time,
+                page=page,
+                size=size,
+                extension=extension,
+                communication_type=communication_type,
+            )
+            for participant_id in participant_ids.split(",")
         ]
+    )
+
+    merger = RecordMerger()
+    for participant_id, data in zip(participant_ids.split(","), pages):
+        merger.add(data["records"], source=participant_id)
+    records = merger.records
+
+    if content:
+        records = await hydrate_records(records, CHANNEL)
     
     return records
 
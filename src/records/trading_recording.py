@@ -1,33 +1,32 @@
 import json
 import time
-import requests
 import asyncio
-from .auth import get_token
+from typing import AsyncIterator
+from .client import ccs_get, iter_pages
 from src.utils import load_config
-from .content import get_content
+from .content import hydrate_records
+from .merge import RecordMerger
 
 
 config = load_config()
-API_BASE_URL = config["CCS_SERVER"]["API_BASE_URL"]
 END_POINT = config["CCS_SERVER"]["TRADING_RECORDING_END_POINT"]
 CHANNEL = "TRADING"
 
 
-async def get_trading_recording_by_participant_ids(
-    participant_ids: str,
+async def query_trading_recording(
+    participant_id: str,
     start_time: str,
     end_time: str,
     page: int = 1,
     size: int = 10,
     extension: str | None = None,
     communication_type: str | None = None,  # 通信类型（internal/external/unknown）
-    content: bool = False,
-) -> list[dict]:
-    """ 
-    Get the trading recording records by participant IDs.
+) -> dict:
+    """
+    Query one page of the trading recording records of a participant.
 
     Args:
-        participant_ids (str, mandatory): Comma-separated participant IDs.
+        participant_id (str, mandatory): Participant ID.
         start_time (str, mandatory): Start time, format "2025-10-01 00:00:00".
         end_time (str, mandatory): End time, format "2025-10-31 23:59:59".
         page (int, optional): Page number. Defaults to 1.
@@ -36,14 +35,11 @@ async def get_trading_recording_by_participant_ids(
         communication_type (str | None, optional): Communication type. Defaults to None.
 
     Returns:
-        list[dict]: List of trading recording records.
+        dict: Page data, contains "records" and "total".
     """
 
-    headers = {
-        "Content-Type": "application/json",
-        "access-token": get_token(),
-    }
     params = {
+        "participantId": participant_id,
         "startTime": start_time,
         "endTime": end_time,
         "page": page,
@@ -54,34 +50,96 @@ async def get_trading_recording_by_participant_ids(
     if communication_type:
         params["communicationType"] = communication_type
 
-    records = []
-    for participant_id in participant_ids.split(","):
-        params["participantId"] = participant_id
-        response = requests.get(
-            f"{API_BASE_URL}{END_POINT}",
-            headers=headers,
-            params=params,
-        )
-        response.raise_for_status()
+    response = await ccs_get(END_POINT, params, "get trading recording records failed")
+    return response["data"]
+
+
+async def iter_trading_recording(
+    participant_id: str,
+    start_time: str,
+    end_time: str,
+    size: int = 100,
+    extension: str | None = None,
+    communication_type: str | None = None,  # 通信类型（internal/external/unknown）
+    semaphores: tuple[asyncio.Semaphore, ...] = (),
+) -> AsyncIterator[list[dict]]:
+    """
+    Walk all pages of the trading recording records of a participant.
+
+    Args:
+        participant_id (str, mandatory): Participant ID.
+        start_time (str, mandatory): Start time, format "2025-10-01 00:00:00".
+        end_time (str, mandatory): End time, format "2025-10-31 23:59:59".
+        size (int, optional): Page size. Defaults to 100.
+        extension (str | None, optional): Extension number. Defaults to None.
+        communication_type (str | None, optional): Communication type. Defaults to None.
+        semaphores (tuple[asyncio.Semaphore, ...], optional): Semaphores held while a page is requested. Defaults to ().
 
-        if response.json()["message"] != "success":
-            raise Exception(f"get trading recording records failed: {response.json()['message']}")
+    Yields:
+        list[dict]: Trading recording records of one page.
+    """
 
-        for record in response.json()["data"]["records"]:
-            if record["id"] not in [r["id"] for r in records]:
-                records.append(record)
+    async for records in iter_pages(
+        query_trading_recording,
+        size=size,
+        semaphores=semaphores,
+        participant_id=participant_id,
+        start_time=start_time,
+        end_time=end_time,
+        extension=extension,
+        communication_type=communication_type,
+    ):
+        yield records
 
-    if content:
-        record_ids = [record["id"] for record in records]
-        content = get_content(record_ids=record_ids, channel=CHANNEL) 
-        records = [
-            {
-                **record,
-                "content": content["data"][i]["content"],
-                "channel": CHANNEL,
-            }
-            for i, record in enumerate(records)
+
+async def get_trading_recording_by_participant_ids(
+    participant_ids: str,
+    start_time: str,
+    end_time: str,
+    page: int = 1,
+    size: int = 10,
+    extension: str | None = None,
+    communication_type: str | None = None,  # 通信类型（internal/external/unknown）
+    content: bool = False,
+) -> list[dict]:
+    """ 
+    Get the trading recording records by participant IDs.
+
+    Args:
+        participant_ids (str, mandatory): Comma-separated participant IDs.
+        start_time (str, mandatory): Start time, format "2025-10-01 00:00:00".
+        end_time (str, mandatory): End time, format "2025-10-31 23:59:59".
+        page (int, optional): Page number. Defaults to 1.
+        size (int, optional): Page size. Defaults to 10.
+        extension (str | None, optional): Extension number. Defaults to None.
+        communication_type (str | None, optional): Communication type. Defaults to None.
+
+    Returns:
+        list[dict]: List of trading recording records.
+    """
+
+    pages = await asyncio.gather(
+        *[
+            query_trading_recording(
+                participant_id=participant_id,
+                start_time=start_time,
+                end_time=end_time,
+                page=page,
+                size=size,
+                extension=extension,
+                communication_type=communication_type,
+            )
+            for participant_id in participant_ids.split(",")
         ]
+    )
+
+    merger = RecordMerger()
+    for participant_id, data in zip(participant_ids.split(","), pages):
+        merger.add(data["records"], source=participant_id)
+    records = merger.records
+
+    if content:
+        records = await hydrate_records(records, CHANNEL)
     
     print(f"[OK] 交易电话记录数: {len(records)}")
     return records
@@ -118,10 +176,6 @@ async def get_trading_recording_by_from_or_to(
     if from_participant_id is None and to_participant_id is None:
         raise ValueError("from_participant_id or to_participant_id must be provided")
 
-    headers = {
-        "Content-Type": "application/json",
-        "access-token": get_token(),
-    }
     params = {
         "startTime": start_time,
         "endTime": end_time,
@@ -138,29 +192,12 @@ async def get_trading_recording_by_from_or_to(
     if to_participant_id is not None:
         params["toParticipantId"] = to_participant_id
 
-    response = requests.get(
-        f"{API_BASE_URL}{END_POINT}",
-        headers=headers,
-        params=params,
-    )
-    response.raise_for_status()
-
-    if response.json()["message"] != "success":
-        raise Exception(f"get trading recording records failed: {response.json()['message']}")
+    response = await ccs_get(END_POINT, params, "get trading recording records failed")
 
-    records = response.json()["data"]["records"]
+    records = response["data"]["records"]
 
     if content:
-        record_ids = [record["id"] for record in records]
-        content = get_content(record_ids=record_ids, channel=CHANNEL) 
-        records = [
-            {
-                **record,
-                "content": content["data"][i]["content"],
-                "channel": CHANNEL,
-            }
-            for i, record in enumerate(records)
-        ]
+        records = await hydrate_records(records, CHANNEL)
     
     print(f"[OK] 交易电话记录数: {len(records)}")
     return records
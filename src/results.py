@@ -0,0 +1,377 @@
+import gzip
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from pathlib import Path
+from loguru import logger
+
+from src.utils import load_config
+
+
+config = load_config()
+RESULTS_CONFIG = config.get("RESULTS", {})
+
+# 结果存储参数，可在 config.toml 的 [RESULTS] 中覆盖
+RESULTS_DIR = Path(RESULTS_CONFIG.get("DIR", Path(__file__).parent / "output"))  # 结果文件和索引目录
+COMPRESSION = RESULTS_CONFIG.get("COMPRESSION", "gzip")  # 结果文件压缩方式: gzip / zstd / none
+RETENTION_DAYS = RESULTS_CONFIG.get("RETENTION_DAYS", 0)  # 结果保留天数，0 表示不按时间清理
+MAX_RESULTS = RESULTS_CONFIG.get("MAX_RESULTS", 1000)  # 保留的最大结果数，超过后删除最早的结果，0 表示不限制
+
+SUFFIXES = {"none": ".json", "gzip": ".json.gz", "zstd": ".json.zst"}
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def encode_result(result: dict, compression: str) -> bytes:
+    data = json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if compression == "gzip":
+        return gzip.compress(data)
+    if compression == "zstd":
+        return _zstd().ZstdCompressor().compress(data)
+    return data
+
+
+def decode_result(data: bytes, path: Path) -> dict:
+    if path.name.endswith(".gz"):
+        data = gzip.decompress(data)
+    elif path.name.endswith(".zst"):
+        data = _zstd().ZstdDecompressor().decompress(data)
+    return json.loads(data)
+
+
+class ResultStore:
+    """
+    事件重构结果存储。
+
+    - 每个结果一个文件（紧凑 JSON，可选 gzip / zstd 压缩），ID 由时间戳和随机后缀组成，不会冲突
+    - SQLite 索引记录事件名称、事件时间、保存时间、记录数和文件路径，列出或查找结果无需扫描目录
+    - 保存时按保留天数和最大结果数删除最早的结果
+    - 索引为空时导入目录中已有的 result_*.json 文件
+
+    方法均为同步调用，在事件循环中应通过 asyncio.to_thread 调用。
+
+    Args:
+        directory (Path): 结果文件和索引目录。
+        compression (str): 压缩方式，gzip / zstd / none；未安装 zstandard 时 zstd 退化为 gzip。
+        retention_days (float): 结果保留天数，0 表示不按时间清理。
+        max_results (int): 保留的最大结果数，0 表示不限制。
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        compression: str = COMPRESSION,
+        retention_days: float = RETENTION_DAYS,
+        max_results: int = MAX_RESULTS,
+    ):
+        if compression not in SUFFIXES:
+            raise ValueError(f"未知的结果压缩方式: {compression}")
+        if compression == "zstd" and _zstd() is None:
+            logger.warning("未安装 zstandard，结果文件使用 gzip 压缩")
+            compression = "gzip"
+
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.compression = compression
+        self.retention_days = retention_days
+        self.max_results = max_results
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(directory / "index.sqlite3", check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                id TEXT PRIMARY KEY,
+                event_name TEXT NOT NULL,
+                event_time TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                record_count INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_event_name ON results (event_name, created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_created_at ON results (created_at)")
+        self._conn.commit()
+
+        if self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 0:
+            self._import_legacy()
+
+    def _import_legacy(self):
+        rows = []
+        for path in sorted(self.directory.glob("result_*.json")):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    result = json.load(f)
+                created_at = time.mktime(time.strptime(path.stem[len("result_") :][:15], "%Y%m%d_%H%M%S"))
+            except (OSError, ValueError) as e:
+                logger.warning(f"无法导入结果文件 {path}: {e}")
+                continue
+            rows.append(self._row(path.stem[len("result_") :], result, created_at, path))
+
+        if rows:
+            self._insert(rows)
+            logger.info(f"导入已有结果文件 {len(rows)} 个")
+
+    def _row(self, result_id: str, result: dict, created_at: float, path: Path) -> tuple:
+        return (
+            result_id,
+            result["event"]["event_name"],
+            result["event"]["event_time"],
+            created_at,
+            len(result["records"]),
+            path.name,
+            path.stat().st_size,
+        )
+
+    def _insert(self, rows: list[tuple]):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results (id, event_name, event_time, created_at, record_count, path, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def save(self, result: dict) -> dict:
+        """
+        保存结果，并按保留策略删除最早的结果。
+
+        参数:
+            result (dict): {"event": 事件信息, "stats": 记录筛选统计, "records": 相关记录}。
+
+        返回:
+            dict: 结果索引条目，见 get。
+        """
+
+        created_at = time.time()
+        result_id = f"{time.strftime('%Y%m%d_%H%M%S', time.localtime(created_at))}_{uuid.uuid4().hex[:8]}"
+        path = self.directory / f"result_{result_id}{SUFFIXES[self.compression]}"
+        data = encode_result({"result_id": result_id, **result}, self.compression)
+
+        # 先写临时文件再重命名，读取时不会读到写了一半的文件
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+        self._insert([self._row(result_id, result, created_at, path)])
+        self.prune()
+        return self.get(result_id)
+
+    def get(self, result_id: str) -> dict | None:
+        """
+        获取结果索引条目。
+
+        参数:
+            result_id (str): 结果 ID。
+
+        返回:
+            dict | None: {"id", "event_name", "event_time", "created_at", "record_count", "path", "size"}，不存在时为 None。
+        """
+
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM results WHERE id = ?", (result_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def load(self, result_id: str) -> dict | None:
+        """
+        读取结果。
+
+        参数:
+            result_id (str): 结果 ID。
+
+        返回:
+            dict | None: 结果，格式同 reconstruct_event 的返回值；不存在时为 None。
+        """
+
+        entry = self.get(result_id)
+        if entry is None:
+            return None
+
+        path = self.directory / entry["path"]
+        try:
+            result = decode_result(path.read_bytes(), path)
+        except FileNotFoundError:
+            logger.warning(f"结果文件不存在: {path}")
+            return None
+        result.setdefault("result_id", result_id)
+        return result
+
+    def query(
+        self,
+        event_name: str | None = None,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> tuple[int, list[dict]]:
+        """
+        按保存时间倒序列出结果索引条目。
+
+        参数:
+            event_name (str | None): 只列出该事件的结果。
+            start_time (float | None): 只列出该时间（Unix 时间戳）之后保存的结果。
+            end_time (float | None): 只列出该时间（Unix 时间戳）之前保存的结果。
+            limit (int): 每页条目数。
+            offset (int): 跳过的条目数。
+
+        返回:
+            tuple[int, list[dict]]: 符合条件的结果总数和本页条目。
+        """
+
+        conditions, params = [], []
+        if event_name is not None:
+            conditions.append("event_name = ?")
+            params.append(event_name)
+        if start_time is not None:
+            conditions.append("created_at >= ?")
+            params.append(start_time)
+        if end_time is not None:
+            conditions.append("created_at <= ?")
+            params.append(end_time)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM results {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT * FROM results {where} ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            ).fetchall()
+        return total, [dict(row) for row in rows]
+
+    def delete(self, result_ids: list[str]):
+        if not result_ids:
+            return
+
+        with self._lock:
+            placeholders = ",".join("?" * len(result_ids))
+            paths = [
+                row["path"]
+                for row in self._conn.execute(f"SELECT path FROM results WHERE id IN ({placeholders})", result_ids)
+            ]
+            self._conn.execute(f"DELETE FROM results WHERE id IN ({placeholders})", result_ids)
+            self._conn.commit()
+
+        for path in paths:
+            (self.directory / path).unlink(missing_ok=True)
+
+    def prune(self):
+        """按保留天数和最大结果数删除最早的结果。"""
+
+        expired = []
+        with self._lock:
+            if self.retention_days:
+                cutoff = time.time() - self.retention_days * 86400
+                expired += [
+                    row["id"] for row in self._conn.execute("SELECT id FROM results WHERE created_at < ?", (cutoff,))
+                ]
+            if self.max_results:
+                expired += [
+                    row["id"]
+                    for row in self._conn.execute(
+                        "SELECT id FROM results ORDER BY created_at DESC, id DESC LIMIT -1 OFFSET ?",
+                        (self.max_results,),
+                    )
+                ]
+
+        expired = list(dict.fromkeys(expired))
+        if expired:
+            self.delete(expired)
+            logger.info(f"按保留策略删除结果 {len(expired)} 个")
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {"results": count, "bytes": size, "compression": self.compression}
+
+
+def record_key(record: dict) -> tuple:
+    # 早期的结果文件没有 record_id，以开始时间和外部用户代替
+    if record.get("record_id") is not None:
+        return (record["channel"], record["record_id"])
+    return (record["channel"], record["start_time"], record["external_user"])
+
+
+def summarize_record(record: dict) -> dict:
+    return {key: value for key, value in record.items() if key != "content"}
+
+
+def diff_results(base: dict, target: dict) -> dict:
+    """
+    比较同一事件的两次重构结果，例如调整权重或阈值前后。
+
+    记录按渠道和记录 ID 对应；返回的记录不含内容。
+
+    参数:
+        base (dict): 基准结果。
+        target (dict): 对比结果。
+
+    返回:
+        dict: {
+            "base": 基准结果 ID, "target": 对比结果 ID,
+            "event_changes": {发生变化的事件参数: {"base": 原值, "target": 新值}},
+            "stats": {"base": 基准结果的记录筛选统计, "target": 对比结果的记录筛选统计},
+            "added": [只在对比结果中的记录], "removed": [只在基准结果中的记录],
+            "changed": [得分或风险评估变化的记录，变化的字段为 {"base": 原值, "target": 新值}],
+            "unchanged": 未变化的记录数,
+        }。
+    """
+
+    base_event, target_event = base["event"], target["event"]
+    event_changes = {
+        key: {"base": base_event.get(key), "target": target_event.get(key)}
+        for key in dict.fromkeys([*base_event, *target_event])
+        if base_event.get(key) != target_event.get(key)
+    }
+
+    base_records = {record_key(record): record for record in base["records"]}
+    target_records = {record_key(record): record for record in target["records"]}
+
+    changed = []
+    unchanged = 0
+    for key, target_record in target_records.items():
+        base_record = base_records.get(key)
+        if base_record is None:
+            continue
+
+        changes = {
+            field: {"base": base_record.get(field), "target": target_record.get(field)}
+            for field in ("score", "risk")
+            if base_record.get(field) != target_record.get(field)
+        }
+        if changes:
+            changed.append(
+                {
+                    "record_id": target_record.get("record_id"),
+                    "channel": target_record["channel"],
+                    "start_time": target_record["start_time"],
+                    **changes,
+                }
+            )
+        else:
+            unchanged += 1
+
+    return {
+        "base": base.get("result_id"),
+        "target": target.get("result_id"),
+        "event_changes": event_changes,
+        "stats": {"base": base.get("stats"), "target": target.get("stats")},
+        "added": [summarize_record(record) for key, record in target_records.items() if key not in base_records],
+        "removed": [summarize_record(record) for key, record in base_records.items() if key not in target_records],
+        "changed": changed,
+        "unchanged": unchanged,
+    }
+
+
+result_store = ResultStore(RESULTS_DIR)
@@ -0,0 +1,97 @@
+import json
+from collections import Counter
+from loguru import logger
+from rich.console import Console
+from rich.table import Table
+
+
+console = Console()
+
+
+def summarize_result(result: dict) -> dict:
+    """
+    生成重构结果的简要统计，用于服务端日志。
+
+    参数:
+        result (dict): 重构结果，格式同 reconstruct_event 的返回值。
+
+    返回:
+        dict: {"result_id", "event_name", "stats", "records": 记录数, "channels": {渠道: 记录数}, "risk_levels": {风险等级: 记录数}, "max_total_score"}。
+    """
+
+    records = result["records"]
+    return {
+        "result_id": result.get("result_id"),
+        "event_name": result["event"]["event_name"],
+        "stats": result.get("stats"),
+        "records": len(records),
+        "channels": dict(Counter(record["channel"] for record in records)),
+        "risk_levels": dict(
+            Counter((record.get("risk") or {}).get("risk_level") or "未评估" for record in records)
+        ),
+        "max_total_score": max((record["score"]["total_score"] for record in records), default=None),
+    }
+
+
+def log_result(result: dict):
+    """
+    以一行结构化日志输出重构结果的简要统计（服务模式），不逐条输出记录。
+
+    参数:
+        result (dict): 重构结果，格式同 reconstruct_event 的返回值。
+    """
+
+    summary = summarize_result(result)
+    logger.info(f"重构完成: {json.dumps(summary, ensure_ascii=False)}")
+
+
+def print_result(result: dict, console: Console = console):
+    """
+    在终端以表格打印重构结果（命令行模式）。
+
+    参数:
+        result (dict): 重构结果，格式同 reconstruct_event 的返回值。
+        console (Console): 输出的 rich 终端，默认标准输出。
+    """
+
+    # 打印事件信息
+    event = result["event"]
+    console.print(f"[bold magenta]事件名称: {event['event_name']}[/bold magenta]")
+    console.print(f"[bold magenta]事件时间: {event['event_time']}[/bold magenta]")
+    console.print(f"[bold magenta]内部用户: {event['internal_users']}[/bold magenta]")
+    console.print(f"[bold magenta]外部用户: {event['external_users']}[/bold magenta]")
+
+    # 用 rich 打印表格
+    records_table = Table(show_header=True, header_style="bold magenta")
+    records_table.add_column("编号", style="dim", width=4)
+    records_table.add_column("时间", width=10)
+    records_table.add_column("渠道", width=8)
+    records_table.add_column("内部用户", width=8)
+    records_table.add_column("外部用户", width=8)
+    records_table.add_column("时间", width=6)
+    records_table.add_column("用户", width=6)
+    records_table.add_column("内容", width=6)
+    records_table.add_column("总相关性", width=8, style="green bold")
+    records_table.add_column("风险等级", width=8)
+    records_table.add_column("风险描述", width=20)
+
+    records = result["records"]
+    for i, record in enumerate(records):
+        score = record["score"]
+        risk = record.get("risk") or {}
+        records_table.add_row(
+            f"{(i + 1):02d}",
+            record["start_time"][-8:],
+            record["channel"],
+            record.get("internal_user"),
+            record["external_user"],
+            str(int(score["time_score"])),
+            str(int(score["user_score"])),
+            str(int(score["content_score"])),
+            str(int(score["total_score"])),
+            risk.get("risk_level"),
+            risk.get("risk_description"),
+        )
+
+    console.print(records_table)
+    console.print(f"[OK] 所有记录获取成功, 记录数: {len(records)}", markup=False)
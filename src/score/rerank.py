@@ -0,0 +1,184 @@
+import asyncio
+import hashlib
+import weakref
+from cachetools import LRUCache
+from loguru import logger
+
+from src.utils import load_config, get_http_client
+from src.utils.cache import SqliteCache
+
+
+config = load_config()
+
+RERANKER_URL = config["RERANKER"]["URL"]
+RERANKER_MODEL = config["RERANKER"]["MODEL"]
+RERANKER_TIMEOUT = config["RERANKER"].get("TIMEOUT", 30)  # 单次请求超时时间（秒）
+BATCH_SIZE = config["RERANKER"].get("BATCH_SIZE", 32)  # 每次请求的文档数
+MAX_CONCURRENCY = config["RERANKER"].get("MAX_CONCURRENCY", 4)  # 同时进行的请求数
+SCORE_CACHE_SIZE = config["RERANKER"].get("SCORE_CACHE_SIZE", 100_000)  # 内存中缓存的得分数
+SCORE_CACHE_PERSISTENT = config["RERANKER"].get("SCORE_CACHE_PERSISTENT", True)  # 是否持久化缓存得分
+SCORE_CACHE_MAX_MB = config["RERANKER"].get("SCORE_CACHE_MAX_MB", 64)  # 持久化得分缓存大小上限（MB）
+
+
+class ScoreCache:
+    """
+    Reranker 得分缓存，键为 (模型, 查询, 文档内容摘要)。
+
+    得分只取决于模型、事件名称和记录内容，调整权重或阈值后重新调查时无需再次请求。
+    先查内存 LRU，未命中再查本地 SQLite（可选）。
+
+    Args:
+        maxsize (int): 内存中缓存的得分数。
+        persistent (bool): 是否使用本地 SQLite 持久化缓存。
+        max_bytes (int | None): 本地 SQLite 缓存的大小上限（字节），None 表示不限制。
+    """
+
+    def __init__(self, maxsize: int, persistent: bool, max_bytes: int | None = None):
+        self.memory = LRUCache(maxsize=maxsize)
+        self.store = SqliteCache("rerank_scores", max_bytes=max_bytes) if persistent else None
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(query: str, document: str) -> str:
+        document_digest = hashlib.sha256(document.encode("utf-8")).hexdigest()
+        return hashlib.sha256(
+            f"{RERANKER_MODEL}\0{query}\0{document_digest}".encode("utf-8")
+        ).hexdigest()
+
+    async def get_many(self, keys: list[str]) -> dict[str, float]:
+        found = {key: self.memory[key] for key in keys if key in self.memory}
+        self.memory_hits += len(found)
+
+        missing = [key for key in keys if key not in found]
+        if missing and self.store is not None:
+            stored = await asyncio.to_thread(self.store.get_many, missing)
+            for key, value in stored.items():
+                found[key] = self.memory[key] = float(value)
+            self.store_hits += len(stored)
+
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def set_many(self, scores: dict[str, float]):
+        self.memory.update(scores)
+        if self.store is not None:
+            await asyncio.to_thread(
+                self.store.set_many, {key: repr(score) for key, score in scores.items()}
+            )
+
+    def stats(self) -> dict:
+        total = self.memory_hits + self.store_hits + self.misses
+        return {
+            "entries": len(self.memory),
+            "memory_hits": self.memory_hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.store_hits) / total if total else 0.0,
+            "store": self.store.stats() if self.store is not None else None,
+        }
+
+
+score_cache = ScoreCache(
+    maxsize=SCORE_CACHE_SIZE,
+    persistent=SCORE_CACHE_PERSISTENT,
+    max_bytes=SCORE_CACHE_MAX_MB * 1024 * 1024,
+)
+
+# 每个事件循环一个信号量，所有 rerank_documents 调用共用同一并发上限
+_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_rerank_semaphore() -> asyncio.Semaphore:
+    """
+    获取当前事件循环共用的 Reranker 请求信号量，首次调用时创建。
+
+    返回:
+        asyncio.Semaphore: 上限为 RERANKER["MAX_CONCURRENCY"] 的信号量。
+    """
+
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENCY)
+    return semaphore
+
+
+async def get_rerank_scores(query: str, documents: list[str]) -> list[dict]:
+    """
+    调用 Reranker 接口，计算查询与每个文档的相关性。
+
+    参数:
+        query (str): 查询文本。
+        documents (list[str]): 文档列表。
+
+    返回:
+        list[dict]: Reranker 结果，每项包含文档在 documents 中的 "index" 和 "relevance_score"。
+    """
+
+    payload = {
+        "model": RERANKER_MODEL,
+        "query": query,
+        "documents": documents,
+        "top_n": len(documents),
+    }
+    response = await get_http_client().post(RERANKER_URL, json=payload, timeout=RERANKER_TIMEOUT)
+    response.raise_for_status()
+    return response.json()["results"]
+
+
+async def rerank_documents(
+    query: str,
+    documents: list[str],
+    batch_size: int = BATCH_SIZE,
+) -> list[float]:
+    """
+    批量计算查询与所有文档的相关性。
+
+    文档按 batch_size 分批并发请求，同一事件循环中所有调用同时进行的请求数合计不超过
+    RERANKER["MAX_CONCURRENCY"]，结果通过返回的 "index" 映射回原文档位置。
+    空文档不发送请求，得分为 0；某一批请求失败时，该批文档得分为 0。
+    已在得分缓存中的文档不发送请求，请求成功的得分写入缓存。
+
+    参数:
+        query (str): 查询文本。
+        documents (list[str]): 文档列表。
+        batch_size (int): 每次请求的文档数，默认 RERANKER["BATCH_SIZE"]。
+
+    返回:
+        list[float]: 与 documents 一一对应的相关性得分，范围在 [0, 1] 之间。
+    """
+
+    scores = [0.0] * len(documents)
+    keys = {i: score_cache.key(query, document) for i, document in enumerate(documents) if document}
+    cached = await score_cache.get_many(list(set(keys.values())))
+    positions = []
+    for i, key in keys.items():
+        if key in cached:
+            scores[i] = cached[key]
+        else:
+            positions.append(i)
+    semaphore = get_rerank_semaphore()
+
+    async def rerank_batch(batch: list[int]):
+        try:
+            async with semaphore:
+                results = await get_rerank_scores(query, [documents[i] for i in batch])
+            for result in results:
+                scores[batch[result["index"]]] = result["relevance_score"]
+            await score_cache.set_many(
+                {keys[batch[result["index"]]]: result["relevance_score"] for result in results}
+            )
+        except Exception as e:
+            logger.error(f"Rerank error: {e}")
+
+    await asyncio.gather(
+        *[
+            rerank_batch(positions[i : i + batch_size])
+            for i in range(0, len(positions), batch_size)
+        ]
+    )
+    return scores
@@ -0,0 +1,547 @@
+import re
+import json
+import random
+import hashlib
+import asyncio
+from typing import Callable, Iterator, Literal
+from datetime import datetime
+from pathlib import Path
+from textwrap import dedent
+from loguru import logger
+from openai import APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+from pydantic import BaseModel, Field, ValidationError
+
+from src.utils import load_config, dashscope_qwen_openai_async
+from src.utils.cache import SqliteCache
+from src.utils.tokens import count_tokens, truncate_to_tokens
+
+
+config = load_config()
+RISK_CONFIG = config.get("RISK", {})
+
+# 风险评估参数，可在 config.toml 的 [RISK] 中覆盖
+MAX_CONCURRENCY = RISK_CONFIG.get("MAX_CONCURRENCY", 4)  # 同时进行的 LLM 请求数
+TIMEOUT = RISK_CONFIG.get("TIMEOUT", 120)  # 单次 LLM 请求超时时间（秒）
+MAX_RETRIES = RISK_CONFIG.get("MAX_RETRIES", 2)  # 失败后的最大重试次数
+RETRY_BACKOFF = RISK_CONFIG.get("RETRY_BACKOFF", 1.0)  # 首次重试等待时间（秒），之后指数增长
+
+# 参考记录上下文，保证提示词长度不随记录数增长
+# - summary: 所有记录的固定长度摘要，所有评估请求共用
+# - window: 与当前记录时间最近的记录
+# - full: 所有记录的完整内容（原有方式，提示词长度随记录数增长）
+CONTEXT_MODE = RISK_CONFIG.get("CONTEXT_MODE", "summary")
+CONTEXT_TOKEN_BUDGET = RISK_CONFIG.get("CONTEXT_TOKEN_BUDGET", 6000)  # 参考记录上下文的 token 上限
+CONTEXT_MIN_TOKENS = RISK_CONFIG.get("CONTEXT_MIN_TOKENS", 64)  # 每条参考记录至少保留的 token 数
+CONTEXT_SEPARATOR = "\n\n---\n\n"
+
+# 评估方式
+# - single: 每条记录一次请求，参考记录上下文在系统提示词中作为公共前缀，当前记录在用户消息中
+# - batch: 每 BATCH_SIZE 条记录一次请求，返回以记录 ID 为键的 JSON 数组
+EVALUATION_MODE = RISK_CONFIG.get("EVALUATION_MODE", "single")
+BATCH_SIZE = RISK_CONFIG.get("BATCH_SIZE", 10)  # batch 模式下每次请求评估的记录数
+
+# 风险评估结果缓存，键为 (模型, 缓存版本, 提示词模板, 记录内容, 参考记录上下文)
+# 修改提示词文件后键随之变化，已有结果自然失效；CACHE_VERSION 用于手动使所有结果失效
+CACHE_ENABLED = RISK_CONFIG.get("CACHE_ENABLED", True)  # 是否缓存风险评估结果
+CACHE_TTL = RISK_CONFIG.get("CACHE_TTL", 0)  # 缓存有效期（秒），0 表示永不过期
+CACHE_VERSION = RISK_CONFIG.get("CACHE_VERSION", 1)  # 缓存版本
+CACHE_MAX_MB = RISK_CONFIG.get("CACHE_MAX_MB", 64)  # 缓存大小上限（MB）
+
+PROMPT_DIR = Path(__file__).parent.parent / "prompts"
+PROMPT_PATH = PROMPT_DIR / "evaluate_record_risk.md"  # 系统提示词（公共前缀）
+USER_PROMPT_PATH = PROMPT_DIR / "evaluate_record_risk_user.md"  # single 模式的用户消息
+BATCH_PROMPT_PATH = PROMPT_DIR / "evaluate_records_risk_batch.md"  # batch 模式的用户消息
+LLM_MODEL = config["DASHSCOPE"]["MODEL"]
+
+llm_client = dashscope_qwen_openai_async
+
+risk_cache = SqliteCache("risk", max_bytes=CACHE_MAX_MB * 1024 * 1024, ttl=CACHE_TTL or None)
+
+OUTPUT_FORMAT = dedent("""
+```json
+{
+    "risk_level": "高/中/低",
+    "risk_description": "详细描述记录中存在的风险，包括风险类型、影响范围、可能的后果等。"
+}
+```
+""").strip()
+
+BATCH_OUTPUT_FORMAT = dedent("""
+```json
+[
+    {
+        "record_id": "记录 ID",
+        "risk_level": "高/中/低",
+        "risk_description": "详细描述记录中存在的风险，包括风险类型、影响范围、可能的后果等。"
+    }
+]
+```
+""").strip()
+
+
+class RiskAssessment(BaseModel):
+    risk_level: Literal["高", "中", "低"] = Field(..., description="风险等级")
+    risk_description: str = Field(..., description="风险描述")
+
+
+class BatchRiskAssessment(RiskAssessment):
+    record_id: str | int = Field(..., description="记录 ID")
+
+
+def format_context_record(record: dict, max_tokens: int) -> str:
+    header = f"[{record['startTime']} {record.get('channel', '')}]"
+    content_tokens = max(max_tokens - count_tokens(header) - 1, 0)
+    return f"{header}\n{truncate_to_tokens(record['content'] or '', content_tokens)}"
+
+
+def build_summary_context(records: list[dict], budget: int = CONTEXT_TOKEN_BUDGET) -> str:
+    """
+    构建所有记录的固定长度摘要，每条记录平均分配 token 预算，预算不足时省略后面的记录。
+
+    参数:
+        records (list[dict]): 按开始时间排序的记录列表。
+        budget (int): 上下文的 token 上限。
+
+    返回:
+        str: 参考记录上下文，所有评估请求共用。
+    """
+
+    if not records:
+        return ""
+
+    separator_tokens = count_tokens(CONTEXT_SEPARATOR)
+    per_record = max(budget // len(records) - separator_tokens, CONTEXT_MIN_TOKENS)
+
+    parts = []
+    used = 0
+    for record in records:
+        part = format_context_record(record, per_record)
+        cost = count_tokens(part) + separator_tokens
+        if used + cost > budget:
+            parts.append(f"……（其余 {len(records) - len(parts)} 条记录已省略）")
+            break
+        parts.append(part)
+        used += cost
+
+    return CONTEXT_SEPARATOR.join(parts)
+
+
+def build_window_context(index: int, records: list[dict], budget: int = CONTEXT_TOKEN_BUDGET) -> str:
+    """
+    构建当前记录的时间邻域上下文：按与当前记录的时间距离由近到远加入其他记录，直到用完 token 预算。
+
+    参数:
+        index (int): 当前记录在 records 中的位置。
+        records (list[dict]): 按开始时间排序的记录列表。
+        budget (int): 上下文的 token 上限。
+
+    返回:
+        str: 参考记录上下文，按时间顺序排列。
+    """
+
+    start_times = [datetime.fromisoformat(record["startTime"]) for record in records]
+    neighbours = sorted(
+        (j for j in range(len(records)) if j != index),
+        key=lambda j: abs(start_times[j] - start_times[index]),
+    )
+
+    separator_tokens = count_tokens(CONTEXT_SEPARATOR)
+    selected = {}
+    remaining = budget
+    for j in neighbours:
+        if remaining - separator_tokens < CONTEXT_MIN_TOKENS:
+            break
+        part = format_context_record(records[j], remaining - separator_tokens)
+        selected[j] = part
+        remaining -= count_tokens(part) + separator_tokens
+
+    return CONTEXT_SEPARATOR.join(selected[j] for j in sorted(selected))
+
+
+def build_records_context(
+    index: int,
+    records: list[dict],
+    mode: str = CONTEXT_MODE,
+    budget: int = CONTEXT_TOKEN_BUDGET,
+) -> str:
+    """
+    按上下文模式构建第 index 条记录风险评估使用的参考记录上下文。
+
+    参数:
+        index (int): 当前记录在 records 中的位置。
+        records (list[dict]): 按开始时间排序的记录列表。
+        mode (str): 上下文模式，summary / window / full，默认 RISK["CONTEXT_MODE"]。
+        budget (int): 上下文的 token 上限，默认 RISK["CONTEXT_TOKEN_BUDGET"]。
+
+    返回:
+        str: 参考记录上下文。
+    """
+
+    if mode == "summary":
+        return build_summary_context(records, budget)
+    elif mode == "window":
+        return build_window_context(index, records, budget)
+    elif mode == "full":
+        return CONTEXT_SEPARATOR.join([r["content"] for r in records])
+    else:
+        raise ValueError(f"未知上下文模式: {mode}")
+
+
+def digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def risk_cache_key(prompt_digest: str, record_content: str, records_content: str) -> str:
+    """
+    风险评估结果的缓存键。
+
+    参数:
+        prompt_digest (str): 评估方式和提示词模板的摘要。
+        record_content (str): 当前记录内容。
+        records_content (str): 参考记录上下文。
+
+    返回:
+        str: 缓存键。
+    """
+
+    return digest(
+        f"{LLM_MODEL}\0{CACHE_VERSION}\0{prompt_digest}\0{digest(record_content)}\0{digest(records_content)}"
+    )
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    判断 LLM 请求错误是否可以重试（超时、连接错误、限流和服务端错误）。
+    """
+
+    if isinstance(error, (asyncio.TimeoutError, APITimeoutError, APIConnectionError, RateLimitError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+async def complete(system_prompt: str, user_prompt: str, json_mode: bool = False) -> str:
+    """
+    调用 LLM，系统提示词在前（各请求共用的前缀），用户消息在后（每个请求不同的部分），
+    便于 vLLM 等服务复用前缀的 KV 缓存。
+
+    参数:
+        system_prompt (str): 系统提示词。
+        user_prompt (str): 用户消息。
+        json_mode (bool): 是否使用服务端的 JSON 输出模式。
+
+    返回:
+        str: LLM 回复内容。
+    """
+
+    kwargs = {"response_format": {"type": "json_object"}} if json_mode else {}
+    response = await llm_client.chat.completions.create(
+        model=LLM_MODEL,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        timeout=TIMEOUT,
+        **kwargs,
+    )
+    return response.choices[0].message.content or ""
+
+
+def iter_json(content: str) -> Iterator[dict | list]:
+    """
+    按出现顺序逐个解析回复中完整的 JSON 对象或数组（包括嵌套在其他 JSON 中的），
+    忽略前后的说明文字、代码块标记和注释。
+
+    参数:
+        content (str): LLM 回复内容。
+
+    产出:
+        dict | list: 解析得到的非空 JSON。
+    """
+
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r"[{\[]", content):
+        try:
+            value, _ = decoder.raw_decode(content, match.start())
+        except json.JSONDecodeError:
+            continue
+        if isinstance(value, (dict, list)) and value:
+            yield value
+
+
+def extract_json(content: str):
+    """
+    提取回复中第一个完整的 JSON 对象或数组，忽略前后的说明文字、代码块标记和注释。
+
+    参数:
+        content (str): LLM 回复内容。
+
+    返回:
+        dict | list: 解析得到的 JSON。
+    """
+
+    value = next(iter_json(content), None)
+    if value is None:
+        raise ValueError(f"回复中没有完整的 JSON: {content[:200]!r}")
+    return value
+
+
+def parse_risk(content: str) -> dict:
+    """
+    解析单条记录的风险评估结果，返回回复中第一个格式正确的 JSON 对象
+    （数组中的对象按顺序参与匹配），跳过说明文字中的引用标记等其他 JSON。
+
+    参数:
+        content (str): LLM 回复内容。
+
+    返回:
+        dict: {"risk_level": "高/中/低", "risk_description": "风险描述"}。
+    """
+
+    error = None
+    for value in iter_json(content):
+        for item in value if isinstance(value, list) else [value]:
+            if not isinstance(item, dict):
+                continue
+            try:
+                return RiskAssessment.model_validate(item).model_dump()
+            except ValidationError as e:
+                error = error or e
+    if error is not None:
+        raise ValueError(f"回复中没有格式正确的风险评估结果: {error}")
+    raise ValueError(f"回复中没有完整的 JSON 对象: {content[:200]!r}")
+
+
+def parse_batch_risks(content: str) -> dict[str, dict]:
+    """
+    解析批量风险评估结果，跳过格式不正确的项。
+
+    参数:
+        content (str): LLM 回复内容。
+
+    返回:
+        dict[str, dict]: 记录 ID -> {"risk_level": "高/中/低", "risk_description": "风险描述"}。
+    """
+
+    value = extract_json(content)
+    if isinstance(value, dict):
+        # JSON 模式下只能返回对象，取其中的第一个数组
+        value = next((v for v in value.values() if isinstance(v, list)), [value])
+
+    risks = {}
+    for item in value:
+        try:
+            assessment = BatchRiskAssessment.model_validate(item)
+        except ValidationError as e:
+            logger.warning(f"跳过格式不正确的批量风险评估结果: {e}")
+            continue
+        risks[str(assessment.record_id)] = assessment.model_dump(exclude={"record_id"})
+    return risks
+
+
+async def evaluate_record_risk(record: dict, system_prompt: str, user_template: str) -> dict:
+    """
+    评估记录的风险等级和描述。
+
+    回复中没有格式正确的结果时，使用 JSON 输出模式重新评估一次，仍不正确则抛出 ValueError。
+
+    参数:
+        record (dict): 包含记录内容的字典，格式为 {"content": "2406 合约相关内容"}。
+        system_prompt (str): 包含参考记录上下文的系统提示词。
+        user_template (str): 用户消息模板。
+
+    返回:
+        dict: 包含风险等级和描述的字典，格式为 {"risk_level": "高/中/低", "risk_description": "详细描述记录中存在的风险，包括风险类型、影响范围、可能的后果等。"}。
+    """
+
+    user_prompt = user_template.format(record_content=record["content"])
+    response_content = await complete(system_prompt, user_prompt)
+    try:
+        return parse_risk(response_content)
+    except ValueError as e:
+        logger.warning(f"风险评估结果格式不正确，使用 JSON 模式重新评估: {e}")
+
+    return parse_risk(await complete(system_prompt, user_prompt, json_mode=True))
+
+
+async def evaluate_batch_risk(records: list[dict], system_prompt: str, batch_template: str) -> dict[str, dict]:
+    """
+    在一次请求中评估多条记录的风险。
+
+    参数:
+        records (list[dict]): 待评估的记录，每条包含 "id" 和 "content"。
+        system_prompt (str): 包含参考记录上下文的系统提示词。
+        batch_template (str): batch 模式的用户消息模板。
+
+    返回:
+        dict[str, dict]: 记录 ID -> 风险评估结果，回复中缺少的记录不在结果中。
+    """
+
+    records_content = "\n\n".join(
+        f"#### 记录 {record['id']}\n\n{record['content']}" for record in records
+    )
+    response_content = await complete(
+        system_prompt, batch_template.format(records_content=records_content)
+    )
+
+    return parse_batch_risks(response_content)
+
+
+async def evaluate_records_risk(
+    records: list[dict],
+    max_concurrency: int = MAX_CONCURRENCY,
+    max_retries: int = MAX_RETRIES,
+    retry_backoff: float = RETRY_BACKOFF,
+    context_mode: str = CONTEXT_MODE,
+    context_budget: int = CONTEXT_TOKEN_BUDGET,
+    evaluation_mode: str = EVALUATION_MODE,
+    batch_size: int = BATCH_SIZE,
+    on_risk: Callable[[int, dict], None] | None = None,
+) -> list[dict]:
+    """
+    并发评估所有记录的风险，结果顺序与 records 一致。
+
+    每个请求的参考记录上下文按 context_mode 构建，长度不超过 context_budget，
+    不随记录数增长。参考记录上下文放在系统提示词中，当前记录放在用户消息中，
+    summary 模式下所有请求的系统提示词相同，可以复用前缀缓存。上下文构建需要分词，在线程中进行。
+
+    batch 模式下每 batch_size 条记录一次请求，回复中缺少的记录再逐条评估。
+
+    RISK["CACHE_ENABLED"] 时，模型、提示词模板、记录内容和参考记录上下文都相同的
+    记录直接使用缓存的结果，评估成功的结果写入缓存。
+
+    同时进行的请求数不超过 max_concurrency；超时、连接错误、限流和服务端错误
+    按指数退避（带随机抖动）重试。重试后仍失败的记录，风险等级为 None，
+    风险描述为失败原因，不影响其他记录的结果。
+
+    参数:
+        records (list[dict]): 按开始时间排序的记录列表。
+        max_concurrency (int): 同时进行的 LLM 请求数，默认 RISK["MAX_CONCURRENCY"]。
+        max_retries (int): 失败后的最大重试次数，默认 RISK["MAX_RETRIES"]。
+        retry_backoff (float): 首次重试等待时间（秒），默认 RISK["RETRY_BACKOFF"]。
+        context_mode (str): 参考记录上下文模式，summary / window / full，默认 RISK["CONTEXT_MODE"]。
+        context_budget (int): 参考记录上下文的 token 上限，默认 RISK["CONTEXT_TOKEN_BUDGET"]。
+        evaluation_mode (str): 评估方式，single / batch，默认 RISK["EVALUATION_MODE"]。
+        batch_size (int): batch 模式下每次请求评估的记录数，默认 RISK["BATCH_SIZE"]。
+        on_risk (Callable[[int, dict], None] | None): 每条记录评估完成（含缓存命中）时调用，
+            参数为记录在 records 中的位置和评估结果。
+
+    返回:
+        list[dict]: 与 records 一一对应的风险评估结果。
+    """
+
+    system_template = PROMPT_PATH.read_text(encoding="utf-8")
+    user_template = USER_PROMPT_PATH.read_text(encoding="utf-8")
+    batch_template = BATCH_PROMPT_PATH.read_text(encoding="utf-8")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    # 构建上下文需要分词，在线程中进行，不阻塞事件循环
+    # 摘要模式下所有记录共用同一份上下文，只构建一次
+    contexts: dict[int, str] = {}
+    shared_context = None
+    if context_mode == "summary":
+        shared_context = await asyncio.to_thread(build_summary_context, records, context_budget)
+
+    def build_context(index: int) -> str:
+        if shared_context is not None:
+            return shared_context
+        if index not in contexts:
+            contexts[index] = build_records_context(index, records, context_mode, context_budget)
+        return contexts[index]
+
+    async def system_prompt(index: int, output_format: str) -> str:
+        records_content = await asyncio.to_thread(build_context, index)
+        return system_template.format(records_content=records_content, output_format=output_format)
+
+    async def with_retries(call):
+        for attempt in range(max_retries + 1):
+            try:
+                async with semaphore:
+                    return await call()
+            except Exception as e:
+                if attempt == max_retries or not is_retryable(e):
+                    raise
+                delay = retry_backoff * 2**attempt * (1 + random.random())
+                logger.warning(f"风险评估失败，{delay:.1f}s 后重试 ({attempt + 1}/{max_retries}): {e}")
+                await asyncio.sleep(delay)
+
+    async def evaluate(index: int) -> dict:
+        prompt = await system_prompt(index, OUTPUT_FORMAT)
+        try:
+            return await with_retries(lambda: evaluate_record_risk(records[index], prompt, user_template))
+        except Exception as e:
+            # 单条记录失败不影响其他记录已完成的评估
+            logger.error(f"记录 {records[index].get('id')} 风险评估失败: {e}")
+            return {"risk_level": None, "risk_description": f"风险评估失败: {e}"}
+
+    async def evaluate_batch(batch: list[int]):
+        # window 模式下以批次中间的记录为中心构建上下文
+        prompt = await system_prompt(batch[len(batch) // 2], BATCH_OUTPUT_FORMAT)
+        try:
+            batch_risks = await with_retries(
+                lambda: evaluate_batch_risk([records[i] for i in batch], prompt, batch_template)
+            )
+        except Exception as e:
+            logger.warning(f"批量风险评估失败，逐条评估: {e}")
+            batch_risks = {}
+
+        missing = []
+        for i in batch:
+            if str(records[i]["id"]) in batch_risks:
+                complete_record(i, batch_risks[str(records[i]["id"])])
+            else:
+                missing.append(i)
+        if missing:
+            logger.warning(f"批量风险评估缺少 {len(missing)} 条记录的结果，逐条评估")
+            await asyncio.gather(*[evaluate_and_complete(i) for i in missing])
+
+    def complete_record(index: int, risk: dict):
+        risks[index] = risk
+        if on_risk is not None:
+            on_risk(index, risk)
+
+    async def evaluate_and_complete(index: int):
+        complete_record(index, await evaluate(index))
+
+    if evaluation_mode not in ("single", "batch"):
+        raise ValueError(f"未知评估方式: {evaluation_mode}")
+
+    risks: list[dict | None] = [None] * len(records)
+
+    # 已缓存的记录不再请求 LLM
+    keys = []
+    if CACHE_ENABLED and records:
+        prompt_digest = digest(
+            "\0".join(
+                [evaluation_mode, system_template, user_template, batch_template, OUTPUT_FORMAT, BATCH_OUTPUT_FORMAT]
+            )
+        )
+        records_contexts = await asyncio.to_thread(lambda: [build_context(i) for i in range(len(records))])
+        keys = [
+            risk_cache_key(prompt_digest, record["content"], records_context)
+            for record, records_context in zip(records, records_contexts)
+        ]
+        cached = await asyncio.to_thread(risk_cache.get_many, list(set(keys)))
+        for i, key in enumerate(keys):
+            if key in cached:
+                complete_record(i, json.loads(cached[key]))
+        logger.info(f"风险评估缓存命中: {len(records) - risks.count(None)}/{len(records)}")
+
+    pending = [i for i, risk in enumerate(risks) if risk is None]
+    if evaluation_mode == "single":
+        await asyncio.gather(*[evaluate_and_complete(i) for i in pending])
+    else:
+        await asyncio.gather(
+            *[evaluate_batch(pending[i : i + batch_size]) for i in range(0, len(pending), batch_size)]
+        )
+
+    # 失败的评估不写入缓存，下次重新评估
+    if keys:
+        await asyncio.to_thread(
+            risk_cache.set_many,
+            {
+                keys[i]: json.dumps(risks[i], ensure_ascii=False)
+                for i in pending
+                if risks[i]["risk_level"] is not None
+            },
+        )
+    return risks
@@ -1,29 +1,28 @@
-import json
 import time
+import math
 import asyncio
-import requests
-from pathlib import Path
+import functools
+import numpy as np
+from typing import AsyncIterator, Callable
 from loguru import logger
-from datetime import datetime
+from datetime import datetime, timedelta
 from pydantic import BaseModel, Field
-from rich.console import Console
-from rich.table import Table
-from rich import print
-from textwrap import dedent
 
-from src.utils import load_config, setup_logger, dashscope_qwen_openai
-from src.records import (
-    get_call_recording,
-    get_email_records,
-    get_qtrade_records,
-    get_ideal_records,
-)
+from src.utils import load_config, setup_logger
+from src.records import stream_records
+from src.records.fanout import STREAM_BUFFER
+from src.score.rerank import rerank_documents
+from src.score.risk import evaluate_records_risk
+from src.results import result_store
+from src.score.report import log_result, print_result
 
 
 # 时间相关性参数 (总分100分，根据记录与事件发生时间的距离计算得分)
 DEDUCT_PER_HOUR = 20  # 每小时扣减的分数
 BEFORE_RATE = 1  # 事件在记录结束时间之后的得分衰减系数（事后通信）
 AFTER_RATE = 2  # 事件在记录开始时间之前的得分衰减系数（事前通信）
+MAX_RECORD_HOURS = 1  # 记录最长持续时间（小时），CCS 按开始时间查询，查询范围提前该时长以免遗漏较长的通话
+MAX_FETCH_HOURS = 24  # 时间得分为 0 的记录也可能达到阈值时，查询事件前后各该时长（小时）的记录
 
 # 打分权重，总数必须为 100
 # WEIGHT_TIME = 30
@@ -56,28 +55,12 @@ EVENT_NAMES = [
     # "SC2406（原油 2406 合约）",
 ]
 
-console = Console()
-
 config = load_config()
 setup_logger()
 
-RERANKER_URL = config["RERANKER"]["URL"]
-RERANKER_MODEL = config["RERANKER"]["MODEL"]
 RERANKER_THRESHOLD = config["RERANKER"]["THRESHOLD"]
 
 
-def get_rerank_scores(query: str, documents: list[str]) -> list[dict]:
-    payload = {
-        "model": RERANKER_MODEL,
-        "query": query,
-        "documents": documents,
-        "top_n": len(documents),
-    }
-    response = requests.post(RERANKER_URL, json=payload, timeout=10)
-    response.raise_for_status()
-    return response.json()["results"]
-
-
 class Weights(BaseModel):
     time: int = Field(..., description="时间权重，范围在 [0, 100] 之间")
     user: int = Field(..., description="用户权重，范围在 [0, 100] 之间")
@@ -136,7 +119,7 @@ def calculate_time_score(event: Event, record: dict) -> float:
         float: 计算得到的时间得分，范围在 [0, 100] 之间。
     """
 
-    time_score = 100
+    time_score = 100.0
 
     time_format = (
         "%Y-%m-%dT%H:%M:%S" if "T" in event.event_time else "%Y-%m-%d %H:%M:%S"
@@ -207,36 +190,33 @@ def calculate_user_score(event: Event, record: dict) -> float:
 
 
 # 内容相关性参数 (总分100分，根据记录与事件发生内容的匹配度计算得分)
-def calculate_content_score(event: Event, record: dict) -> float:
+async def calculate_content_scores(event: Event, records: list[dict]) -> list[float]:
     """
-    计算记录与事件发生内容的内容得分。
+    批量计算记录与事件发生内容的内容得分，所有记录的内容按批次发送给 Reranker。
 
     参数:
         event (Event): 包含事件名称的对象，格式为 {"event_name": "AU2406（沪金 2406 合约）"}。
-        record (dict): 包含记录内容的字典，格式为 {"content": "2406 合约相关内容"}。
+        records (list[dict]): 包含记录内容的字典列表，格式为 [{"content": "2406 合约相关内容"}]。
 
     返回:
-        float: 计算得到的内容得分，范围在 [0, 100] 之间。
+        list[float]: 与 records 一一对应的内容得分，范围在 [0, 100] 之间。
     """
 
-    if record["content"]:
-        try:
-            rerank_scores = get_rerank_scores(event.event_name, [record["content"]])
-            content_score = rerank_scores[0]["relevance_score"] * 100
-        except Exception as e:
-            logger.error(f"Rerank error: {e}")
-            content_score = 0.0
-    return max(content_score, 0.0)
+    rerank_scores = await rerank_documents(
+        event.event_name, [record["content"] for record in records]
+    )
+    return [max(score * 100, 0.0) for score in rerank_scores]
 
 
 # 综合得分参数 (总分100分，根据时间、用户、内容得分计算综合得分)
-def calculate_total_score(event: Event, record: dict) -> dict:
+def calculate_total_score(event: Event, record: dict, content_score: float) -> dict:
     """
     计算记录与事件发生的综合得分。
 
     参数:
         event (Event): 包含事件信息的对象，格式为 {"time": "2026-01-19T12:00:00", "user": "1772917751770292225", "event_name": "AU2406（沪金 2406 合约）"}。
         record (dict): 包含记录信息的字典，格式为 {"startTime": "2026-01-19T10:00:00", "endTime": "2026-01-19T14:00:00", "user": "1772917751770292225", "content": "2406 合约相关内容"}。
+        content_score (float): 由 calculate_content_scores 计算得到的内容得分。
 
     返回:
         dict: 包含时间得分、用户得分、内容得分和综合得分的字典，格式为 {"time_score": 80.0, "user_score": 90.0, "content_score": 70.0, "total_score": 83.0}。
@@ -244,7 +224,6 @@ def calculate_total_score(event: Event, record: dict) -> dict:
 
     time_score = calculate_time_score(event, record)
     user_score = calculate_user_score(event, record)
-    content_score = calculate_content_score(event, record)
     total_score = (
         time_score * (event.weights.time / 100)
         + user_score * (event.weights.user / 100)
@@ -259,186 +238,341 @@ def calculate_total_score(event: Event, record: dict) -> dict:
     }
 
 
-# === 获取记录 ===
-async def get_records():
+def calculate_total_scores(event: Event, records: list[dict], content_scores: list[float]) -> list[dict]:
     """
-    获取事件相关的记录。
+    批量计算一批记录与事件发生的综合得分，结果与逐条调用 calculate_total_score 相同。
+
+    时间只解析一次，转换为 NumPy datetime64 列；用户通过集合匹配；
+    时间得分、用户得分和综合得分在一次向量化计算中得到。
+
+    参数:
+        event (Event): 事件。
+        records (list[dict]): 记录列表。
+        content_scores (list[float]): 与 records 一一对应的内容得分。
 
     返回:
-        list[dict]: 包含通话记录、邮件记录、QTrade记录和Ideal记录的列表。
+        list[dict]: 与 records 一一对应的得分字典，格式同 calculate_total_score。
     """
 
-    PARTICIPANT_IDS = ",".join(
-        [
-            "1772917751770292225",  # 黄金
-            "zhangxuesong",  # 张雪松
-        ]
-    )
-    START_TIME = "2026-01-19 00:00:00"
-    END_TIME = "2026-01-19 23:59:59"
-    PAGE = 1
-    SIZE = 100
-
-    # === 通话记录 ===
-    call_recording_records = await get_call_recording(
-        participant_ids=PARTICIPANT_IDS,
-        start_time=START_TIME,
-        end_time=END_TIME,
-        page=PAGE,
-        size=SIZE,
-        content=True,
-    )
+    if not records:
+        return []
 
-    # === 邮件记录 ===
-    email_records = await get_email_records(
-        participant_ids=PARTICIPANT_IDS,
-        start_time=START_TIME,
-        end_time=END_TIME,
-        page=PAGE,
-        size=SIZE,
-        content=True,
+    # 时间得分
+    event_time = np.datetime64(event.event_time, "s")
+    start_times = np.array([record["startTime"] for record in records], dtype="datetime64[s]")
+    # 处理没有结束时间的记录，如果没有结束时间，默认结束时间为开始时间
+    end_times = np.array(
+        [record.get("endTime", record["startTime"]) for record in records], dtype="datetime64[s]"
     )
 
-    # === QTrade记录 ===
-    qtrade_records = await get_qtrade_records(
-        participant_ids=PARTICIPANT_IDS,
-        start_time=START_TIME,
-        end_time=END_TIME,
-        page=PAGE,
-        size=SIZE,
-        content=True,
+    hours_after_end = (event_time - end_times).astype(np.float64) / 3600
+    hours_before_start = (start_times - event_time).astype(np.float64) / 3600
+    time_scores = np.where(
+        event_time > end_times,
+        100.0 - (hours_after_end * DEDUCT_PER_HOUR) * BEFORE_RATE,
+        np.where(
+            event_time < start_times,
+            100.0 - (hours_before_start * DEDUCT_PER_HOUR) * AFTER_RATE,
+            100.0,
+        ),
     )
+    time_scores = np.maximum(time_scores, 0.0)
 
-    # === Ideal记录 ===
-    ideal_records = await get_ideal_records(
-        participant_ids=PARTICIPANT_IDS,
-        start_time=START_TIME,
-        end_time=END_TIME,
-        page=PAGE,
-        size=SIZE,
-        content=True,
+    # 用户得分
+    internal_users = set(event.internal_users)
+    external_users = set(event.external_users)
+    internal_user_scores = np.array(
+        [100.0 if record["userId"] in internal_users else 0.0 for record in records]
     )
-
-    records = (
-        call_recording_records + email_records + qtrade_records + ideal_records
+    external_user_scores = np.array(
+        [100.0 if get_external_user_name(record) in external_users else 0.0 for record in records]
     )
-    return records
+    user_scores = np.maximum((internal_user_scores + external_user_scores) / 2, 0.0)
+
+    # 综合得分
+    content_scores = np.asarray(content_scores, dtype=np.float64)
+    channel_weights = np.array([WEIGHT_CHANNELS[record["channel"]] for record in records], dtype=np.float64)
+    total_scores = (
+        time_scores * (event.weights.time / 100)
+        + user_scores * (event.weights.user / 100)
+        + content_scores * (event.weights.content / 100)
+    ) * (channel_weights / 100)
+
+    return [
+        {
+            "time_score": time_score,
+            "user_score": user_score,
+            "content_score": content_score,
+            "total_score": total_score,
+        }
+        for time_score, user_score, content_score, total_score in zip(
+            time_scores.tolist(), user_scores.tolist(), content_scores.tolist(), total_scores.tolist()
+        )
+    ]
 
 
-# === 评估记录风险 ===
-def evaluate_record_risk(record: dict, records: list[dict]) -> dict:
+def rescore_records(
+    records: list[dict],
+    weights: Weights,
+    relevance: float,
+    weight_channels: dict[str, float] = WEIGHT_CHANNELS,
+) -> list[dict]:
     """
-    评估记录的风险等级和描述。
+    按新的权重、阈值和渠道权重重新计算已打分记录的综合得分并筛选。
+
+    时间、用户、内容得分与权重无关，直接复用，只重新计算综合得分，不请求 CCS 和 Reranker。
 
     参数:
-        record (dict): 包含记录内容的字典，格式为 {"content": "2406 合约相关内容"}。
-        records (list[dict]): 包含所有记录内容的列表，每个元素为 {"content": "记录内容"}。
+        records (list[dict]): 输出格式的记录（见 format_record），包含 "score"。
+        weights (Weights): 新的打分权重。
+        relevance (float): 新的相关性阈值。
+        weight_channels (dict[str, float]): 新的渠道权重，默认 WEIGHT_CHANNELS。
 
     返回:
-        dict: 包含风险等级和描述的字典，格式为 {"risk_level": "高/中/低", "risk_description": "详细描述记录中存在的风险，包括风险类型、影响范围、可能的后果等。"}。
-    """ 
-
-    output_format = dedent("""
-    ```json
-    {
-        "risk_level": "高/中/低",
-        "risk_description": "详细描述记录中存在的风险，包括风险类型、影响范围、可能的后果等。"
-    }
-    ```
-    """).strip()
-
-    system_prompt_path = Path(__file__).parent.parent / "prompts/evaluate_record_risk.md"
-    system_prompt = system_prompt_path.read_text(encoding="utf-8").format(
-        records_content="\n\n---\n\n".join([r["content"] for r in records]),
-        record_content=record["content"],
-        output_format=output_format,
+        list[dict]: 综合得分大于等于 relevance 的记录（"score" 已更新），按开始时间排序。
+    """
+
+    if not records:
+        return []
+
+    time_scores = np.array([record["score"]["time_score"] for record in records], dtype=np.float64)
+    user_scores = np.array([record["score"]["user_score"] for record in records], dtype=np.float64)
+    content_scores = np.array([record["score"]["content_score"] for record in records], dtype=np.float64)
+    channel_weights = np.array([weight_channels[record["channel"]] for record in records], dtype=np.float64)
+    # 与 calculate_total_scores 的计算顺序一致，权重不变时综合得分完全相同
+    total_scores = (
+        time_scores * (weights.time / 100)
+        + user_scores * (weights.user / 100)
+        + content_scores * (weights.content / 100)
+    ) * (channel_weights / 100)
+
+    rescored = [
+        {**record, "score": {**record["score"], "total_score": total_score}}
+        for record, total_score in zip(records, total_scores.tolist())
+        if total_score >= relevance
+    ]
+    rescored.sort(key=lambda x: datetime.fromisoformat(x["start_time"]))
+    return rescored
+
+
+# === 获取记录 ===
+def get_fetch_window(event: Event) -> tuple[list[str], str, str]:
+    """
+    获取事件需要查询的参与人和时间范围。
+
+    参与人为事件的内部用户。假设用户得分和内容得分均为满分、渠道权重取最高，
+    求出达到阈值所需的最低时间得分：
+
+    - 最低时间得分大于 0 时，时间范围为时间得分仍不低于该值的区间（按 DEDUCT_PER_HOUR、
+      BEFORE_RATE、AFTER_RATE 计算），范围之外的记录不可能达到阈值
+    - 否则时间得分为 0 的记录也可能达到阈值，时间得分无法限定范围，
+      改为查询事件前后各 MAX_FETCH_HOURS 小时，范围之外的记录即使达到阈值也不会获取
+
+    CCS 按记录开始时间查询，开始时间再提前 MAX_RECORD_HOURS。
+
+    参数:
+        event (Event): 事件。
+
+    返回:
+        tuple[list[str], str, str]: 参与人 ID 列表、开始时间和结束时间（按记录开始时间查询）。
+    """
+
+    # 达到阈值所需的最低时间得分
+    max_channel_weight = max(WEIGHT_CHANNELS.values()) / 100
+    min_time_score = 0.0
+    if event.weights.time > 0:
+        min_time_score = (
+            event.relevance / max_channel_weight - event.weights.user - event.weights.content
+        ) / (event.weights.time / 100)
+
+    if min_time_score > 0:
+        # 事件之前（事后通信）和之后（事前通信）时间得分衰减到最低时间得分的秒数
+        min_time_score = min(min_time_score, 100.0)
+        seconds_before = math.ceil((100 - min_time_score) / (DEDUCT_PER_HOUR * BEFORE_RATE) * 3600)
+        seconds_after = math.ceil((100 - min_time_score) / (DEDUCT_PER_HOUR * AFTER_RATE) * 3600)
+    else:
+        seconds_before = seconds_after = MAX_FETCH_HOURS * 3600
+        logger.info(
+            f"事件 {event.event_name} 的阈值不限制时间得分，查询事件前后各 {MAX_FETCH_HOURS} 小时的记录，"
+            "范围之外的记录不会获取"
+        )
+
+    event_time = datetime.fromisoformat(event.event_time)
+    start_time = event_time - timedelta(seconds=seconds_before, hours=MAX_RECORD_HOURS)
+    end_time = event_time + timedelta(seconds=seconds_after)
+
+    return (
+        list(event.internal_users),
+        start_time.strftime("%Y-%m-%d %H:%M:%S"),
+        end_time.strftime("%Y-%m-%d %H:%M:%S"),
     )
 
-    response = dashscope_qwen_openai.chat.completions.create(
-        model=config["DASHSCOPE"]["MODEL"],
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": "执行'记录风险评估任务'"},
-        ],
+
+def merge_fetch_windows(events: list[Event]) -> list[tuple[list[str], str, str, list[int]]]:
+    """
+    合并多个事件的查询范围：参与人相同且时间范围重叠的事件合并为一次查询。
+
+    参与人不同的事件分别查询，每次查询获取到的记录只属于参与该查询的事件，
+    因此每个事件得到的记录与单独重构时相同。
+
+    参数:
+        events (list[Event]): 事件列表。
+
+    返回:
+        list[tuple[list[str], str, str, list[int]]]: 查询范围，每项为参与人 ID 列表、开始时间、结束时间和
+            参与该查询的事件在 events 中的位置。
+    """
+
+    windows = sorted(
+        ((*get_fetch_window(event), i) for i, event in enumerate(events)),
+        key=lambda window: (sorted(set(window[0])), datetime.fromisoformat(window[1])),
     )
-    response_content = response.choices[0].message.content
-    response_json = json.loads(response_content.replace("```json", "").replace("```", ""))
-
-    return response_json
-
-
-# === 打印记录 ===
-def print_records(new_event: Event, records: list[dict]):
-    # 打印事件信息
-    console.print(f"[bold magenta]事件名称: {new_event.event_name}[/bold magenta]")
-    console.print(f"[bold magenta]事件时间: {new_event.event_time}[/bold magenta]")
-    console.print(f"[bold magenta]内部用户: {new_event.internal_users}[/bold magenta]")  
-    console.print(f"[bold magenta]外部用户: {new_event.external_users}[/bold magenta]")
-
-    # 用 rich 打印表格
-    records_table = Table(show_header=True, header_style="bold magenta")
-    records_table.add_column("编号", style="dim", width=4)
-    records_table.add_column("时间", width=10)
-    records_table.add_column("渠道", width=8)
-    records_table.add_column("内部用户", width=8)
-    records_table.add_column("外部用户", width=8)
-    records_table.add_column("时间", width=6)
-    records_table.add_column("用户", width=6)
-    records_table.add_column("内容", width=6)
-    records_table.add_column("总相关性", width=8, style="green bold")
-    records_table.add_column("风险等级", width=8)
-    records_table.add_column("风险描述", width=20)
-
-    for i, record in enumerate(records):
-        score = record["score"]
-        records_table.add_row(
-            f"{(i + 1):02d}",
-            record["start_time"][-8:],
-            record["channel"],
-            USER_MAPPING.get(record["internal_user"], record["internal_user"]),
-            record["external_user"],
-            str(int(score["time_score"])),
-            str(int(score["user_score"])),
-            str(int(score["content_score"])),
-            str(int(score["total_score"])),
-            record["risk"]["risk_level"],
-            record["risk"]["risk_description"],
-        )
 
-    console.print(records_table)
+    merged = []
+    for participant_ids, start_time, end_time, i in windows:
+        if (
+            merged
+            and set(participant_ids) == set(merged[-1][0])
+            and datetime.fromisoformat(start_time) <= datetime.fromisoformat(merged[-1][2])
+        ):
+            last_participant_ids, last_start_time, last_end_time, indices = merged[-1]
+            merged[-1] = (
+                last_participant_ids,
+                last_start_time,
+                max(last_end_time, end_time, key=datetime.fromisoformat),
+                indices + [i],
+            )
+        else:
+            merged.append((list(participant_ids), start_time, end_time, [i]))
+    return merged
 
-    # print(
-    #     "=== All Records (By Participant IDs) ===\n",
-    #     json.dumps(all_records, ensure_ascii=False, indent=2),
-    # )
-    print(f"[OK] 所有记录获取成功, 记录数: {len(records)}")
 
+def in_fetch_window(record: dict, start_time: str, end_time: str) -> bool:
+    return start_time <= record["startTime"].replace("T", " ") <= end_time
 
-async def reconstruct_event(new_event: Event):    
-    # === 获取记录 ===
-    records = await get_records()
 
-    # === 计算得分 ===
-    for i, record in enumerate(records):
-        score = calculate_total_score(new_event, record)
-        records[i]["score"] = score
+def select_candidates(event: Event, records: list[dict], start_time: str, end_time: str) -> list[int]:
+    """
+    在计算内容得分之前筛选可能达到相关性阈值的记录。
+
+    时间得分和用户得分无需请求外部服务，内容得分最高为 100，
+    因此内容得分取满分时的综合得分就是综合得分的上界；上界低于阈值的记录被剪除，
+    不获取内容，也不请求 Reranker。
 
-    # 按总分对记录排序, 只保留总分大于等于阈值的记录
-    records = [
-        record
-        for record in records
-        if record["score"]["total_score"] >= new_event.relevance
+    参数:
+        event (Event): 事件。
+        records (list[dict]): 记录列表（无需内容）。
+        start_time (str): 事件的查询开始时间。
+        end_time (str): 事件的查询结束时间。
+
+    返回:
+        list[int]: 在事件时间范围内且综合得分上界不低于阈值的记录位置。
+    """
+
+    upper_bounds = calculate_total_scores(event, records, [100.0] * len(records))
+    return [
+        i
+        for i, (record, upper_bound) in enumerate(zip(records, upper_bounds))
+        if in_fetch_window(record, start_time, end_time) and upper_bound["total_score"] >= event.relevance
     ]
 
+
+async def iter_records(
+    participant_ids: list[str],
+    start_time: str,
+    end_time: str,
+    select: Callable[[list[dict]], list[dict]] | None = None,
+) -> AsyncIterator[list[dict]]:
+    """
+    分批获取事件相关的记录，每个渠道的所有分页都会被获取。
+
+    参数:
+        participant_ids (list[str]): 参与人 ID 列表。
+        start_time (str): 开始时间，格式为 "2026-01-19 00:00:00"。
+        end_time (str): 结束时间，格式为 "2026-01-19 23:59:59"。
+        select (Callable[[list[dict]], list[dict]] | None): 获取内容之前筛选记录，只获取返回的记录的内容。
+
+    产出:
+        list[dict]: 一批通话记录、邮件记录、QTrade记录或Ideal记录（已包含内容）。
+    """
+
+    # === 通话、邮件、QTrade、Ideal 记录并发分页获取 ===
+    mergers = {}
+    async for records in stream_records(
+        participant_ids=participant_ids,
+        start_time=start_time,
+        end_time=end_time,
+        content=True,
+        mergers=mergers,
+        select=select,
+    ):
+        yield records
+
+    for channel, merger in mergers.items():
+        logger.info(f"{channel} 记录去重: {merger.stats()}")
+
+
+def format_record(record: dict) -> dict:
+    """
+    将打分后的记录转换为输出格式。
+
+    参数:
+        record (dict): 包含 "score" 的记录，风险评估完成后还包含 "risk"。
+
+    返回:
+        dict: 输出记录，未评估风险时 "risk" 为 None。
+    """
+
+    return {
+        "record_id": record["id"],
+        "internal_user": USER_MAPPING.get(record["userId"], record["userId"]),
+        "external_user": get_external_user_name(record),
+        "start_time": record["startTime"],
+        "end_time": record.get("endTime", record["startTime"]),
+        "channel": record["channel"],
+        "content": record["content"],
+        "score": record["score"],
+        "risk": record.get("risk"),
+    }
+
+
+async def finish_event(
+    new_event: Event,
+    records: list[dict],
+    stats: dict,
+    progress: dict,
+    on_risk: Callable[[dict, dict], None] | None = None,
+) -> dict:
+    """
+    对事件筛选后的相关记录排序、评估风险，保存结果并输出简要统计日志。
+
+    参数:
+        new_event (Event): 事件。
+        records (list[dict]): 总分大于等于阈值的记录。
+        stats (dict): 记录筛选统计。
+        progress (dict): 进度，见 reconstruct_events。
+        on_risk (Callable[[dict, dict], None] | None): 每条记录风险评估完成时调用，参数为记录和评估结果。
+
+    返回:
+        dict: {"result_id": 结果 ID, "event": 事件信息, "stats": 记录筛选统计, "records": 相关记录}。
+    """
+
     # 按开始时间排序，开始时间是一个字符串，需要考虑先转换成datetime再排序
     records.sort(key=lambda x: datetime.fromisoformat(x["startTime"]))
 
     if new_event.ai_check_record:
         # === 评估记录风险 ===
-        for i, record in enumerate(records):
-            risk = evaluate_record_risk(record, records)
-            records[i]["risk"] = risk
-            print(risk)
+        progress["stage"] = "risk"
+        progress["risk"]["total"] += len(records)
+
+        def on_record_risk(index: int, risk: dict):
+            progress["risk"]["done"] += 1
+            if on_risk is not None:
+                on_risk(records[index], risk)
+
+        risks = await evaluate_records_risk(records, on_risk=on_record_risk)
+        for record, risk in zip(records, risks):
+            record["risk"] = risk
     else:
         for record in records:
             record["risk"] = {
@@ -446,46 +580,162 @@ async def reconstruct_event(new_event: Event):
                 "risk_description": None,
             }
 
-    new_records = []
-    for record in records:
-        if "endTime" not in record:
-            end_time = record["startTime"]
-        else:
-            end_time = record["endTime"]
-
-        internal_user = USER_MAPPING.get(record["userId"], record["userId"])
-        external_user = get_external_user_name(record)
-
-        new_record = {
-            "internal_user": internal_user,
-            "external_user": external_user,
-            "start_time": record["startTime"],
-            "end_time": end_time,
-            "channel": record["channel"],
-            "content": record["content"],
-            "score": record["score"],
-            "risk": record["risk"],
-        }
-        new_records.append(new_record)
-
-    # === 打印记录 ===
-    print_records(new_event, new_records)
+    new_records = [format_record(record) for record in records]
 
     result = {
         "event": new_event.model_dump(),
+        "stats": stats,
         "records": new_records,
     }
 
     # === 保存记录 ===
-    output_fold = Path(__file__).parent.parent / "output"
-    output_fold.mkdir(parents=True, exist_ok=True)
-    result_path = output_fold / f"result_{time.strftime('%Y%m%d_%H%M%S')}.json"
-
-    with open(result_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+    # 压缩和写文件不阻塞事件循环
+    progress["stage"] = "save"
+    entry = await asyncio.to_thread(result_store.save, result)
+    logger.info(f"结果已保存: {entry['id']} ({entry['path']}, {entry['size']} bytes)")
 
+    result = {"result_id": entry["id"], **result}
+    log_result(result)
     return result
 
+async def reconstruct_events(
+    events: list[Event],
+    progress: dict | None = None,
+    on_record: Callable[[int, dict], None] | None = None,
+    on_risk: Callable[[int, dict], None] | None = None,
+) -> list[dict]:
+    """
+    重构多个事件的相关记录，参与人相同的事件共用一次记录获取。
+
+    参与人相同且时间范围重叠的事件合并查询，每条记录只获取一次；获取内容之前剪除对所有事件
+    都不可能达到阈值的记录；每批记录对各事件的候选记录并发计算 Reranker 得分，
+    再分别按各事件的权重和阈值打分、筛选。
+
+    参数:
+        events (list[Event]): 事件列表。
+        progress (dict | None): 传入 dict 时实时写入进度，用于查询任务状态：
+            {"stage": "fetch/risk/save/done", "events": [每个事件的记录筛选统计], "risk": {"done": 0, "total": 0}}。
+        on_record (Callable[[int, dict], None] | None): 每条相关记录打分完成时调用（按打分完成的顺序，
+            而非最终的时间顺序），参数为事件在 events 中的位置和输出格式的记录（不含风险评估）。
+        on_risk (Callable[[int, dict], None] | None): 每条记录风险评估完成时调用，参数为事件在 events 中的位置和
+            {"record_id": 记录 ID, "channel": 渠道, "risk": 评估结果}。
+
+    返回:
+        list[dict]: 与 events 一一对应的结果，格式同 reconstruct_event。
+    """
+
+    # === 获取记录并计算得分 ===
+    # 边获取边打分, 获取内容之前剪除综合得分上界低于阈值的记录,
+    # 每批记录的内容批量发送给 Reranker, 只保留总分大于等于阈值的记录,
+    # 其余记录不在内存中累积
+    fetch_windows = [get_fetch_window(event) for event in events]
+    # fetched: 事件时间范围内获取到的记录数, pruned: 上界低于阈值被剪除的记录数,
+    # scored: 计算内容得分的记录数, relevant: 总分大于等于阈值的记录数
+    stats = [{"fetched": 0, "pruned": 0, "scored": 0, "relevant": 0} for _ in events]
+    progress = {} if progress is None else progress
+    progress.update({"stage": "fetch", "events": stats, "risk": {"done": 0, "total": 0}})
+
+    def prune(indices: list[int], records: list[dict]) -> list[dict]:
+        selected = set()
+        for i in indices:
+            _, start_time, end_time = fetch_windows[i]
+            candidates = select_candidates(events[i], records, start_time, end_time)
+            fetched = sum(in_fetch_window(record, start_time, end_time) for record in records)
+            stats[i]["fetched"] += fetched
+            stats[i]["pruned"] += fetched - len(candidates)
+            selected.update(candidates)
+        return [records[j] for j in sorted(selected)]
+
+    async def score_batch(indices: list[int], batch: list[dict]) -> list[list[dict]]:
+        # 合并查询时只对事件自身的候选记录打分，结果与单独重构该事件相同
+        candidates = {i: select_candidates(events[i], batch, *fetch_windows[i][1:]) for i in indices}
+
+        # Reranker 得分只取决于事件名称和记录内容，名称相同的事件合并候选记录，只请求一次
+        names = {}
+        for i in indices:
+            names.setdefault(events[i].event_name, []).append(i)
+        content_scores = {}
+
+        async def score_name(event_name: str, group: list[int]):
+            positions = sorted(set().union(*(candidates[i] for i in group)))
+            scores = await calculate_content_scores(events[group[0]], [batch[j] for j in positions])
+            content_scores.update({(event_name, j): score for j, score in zip(positions, scores)})
+
+        await asyncio.gather(*[score_name(event_name, group) for event_name, group in names.items()])
+
+        # 按各事件的权重和阈值打分、筛选，参与该查询之外的事件为空
+        events_records = [[] for _ in events]
+        for i in indices:
+            event = events[i]
+            records = [batch[j] for j in candidates[i]]
+            scores = calculate_total_scores(
+                event, records, [content_scores[(event.event_name, j)] for j in candidates[i]]
+            )
+            relevant_records = [
+                {**record, "score": score}
+                for record, score in zip(records, scores)
+                if score["total_score"] >= event.relevance
+            ]
+            stats[i]["scored"] += len(records)
+            stats[i]["relevant"] += len(relevant_records)
+            if on_record is not None:
+                for record in relevant_records:
+                    on_record(i, format_record(record))
+            events_records[i] = relevant_records
+        return events_records
+
+    # 同时打分的批次数不超过 STREAM_BUFFER，打分跟不上时暂停获取，内存中的批次数保持有界
+    scoring = asyncio.Semaphore(STREAM_BUFFER)
+
+    async def score_batch_bounded(indices: list[int], batch: list[dict]) -> list[list[dict]]:
+        try:
+            return await score_batch(indices, batch)
+        finally:
+            scoring.release()
+
+    tasks = []
+    try:
+        for participant_ids, start_time, end_time, indices in merge_fetch_windows(events):
+            async for batch in iter_records(
+                participant_ids, start_time, end_time, select=functools.partial(prune, indices)
+            ):
+                await scoring.acquire()
+                tasks.append(asyncio.create_task(score_batch_bounded(indices, batch)))
+        batches = await asyncio.gather(*tasks)
+    finally:
+        # 获取或打分失败、任务被取消时，停止其余打分任务并取回其异常
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = []
+    for i, event in enumerate(events):
+        logger.info(f"事件 {event.event_name} 记录筛选: {stats[i]}")
+        records = [record for events_records in batches for record in events_records[i]]
+
+        def event_on_risk(record: dict, risk: dict):
+            if on_risk is not None:
+                on_risk(i, {"record_id": record["id"], "channel": record["channel"], "risk": risk})
+
+        results.append(await finish_event(event, records, stats[i], progress, on_risk=event_on_risk))
+    progress["stage"] = "done"
+    return results
+
+
+async def reconstruct_event(new_event: Event) -> dict:
+    """
+    重构事件相关记录并返回评估结果。
+
+    参数:
+        new_event (Event): 事件。
+
+    返回:
+        dict: {"result_id": 结果 ID, "event": 事件信息, "stats": 记录筛选统计, "records": 相关记录}。
+    """
+
+    return (await reconstruct_events([new_event]))[0]
+
+
 if __name__ == "__main__":
     # === 初始化事件 ===
     new_event = Event(
@@ -495,9 +745,12 @@ if __name__ == "__main__":
             "1772917751770292225",
         ],
         external_users=["韩梅梅", "周子航"],
+        relevance=50,
+        weights=Weights(time=30, user=30, content=40),
     )
 
     start_time = time.time()
-    asyncio.run(reconstruct_event(new_event))
+    result = asyncio.run(reconstruct_event(new_event))
     end_time = time.time()
+    print_result(result)
     print(f"[OK] 总耗时: {end_time - start_time:.2f} seconds")
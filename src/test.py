@@ -1,7 +1,19 @@
-import json
-import requests
+import sys
+from pathlib import Path
 
-API_URL = "http://localhost:8000/reconstruct"
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import json  # noqa: E402
+import time  # noqa: E402
+import requests  # noqa: E402
+from src.score.report import print_result  # noqa: E402
+
+API_BASE_URL = "http://localhost:8000"
+API_URL = f"{API_BASE_URL}/jobs"
+POLL_INTERVAL = 2  # 查询任务状态的间隔（秒）
 
 
 def test_reconstruct():
@@ -16,6 +28,8 @@ def test_reconstruct():
             "1772917751770292225",
         ],
         "external_users": ["韩梅梅", "周子航"],
+        "relevance": 50,
+        "weights": {"time": 30, "user": 30, "content": 40},
     }
 
     print(f"发送请求到: {API_URL}")
@@ -23,38 +37,31 @@ def test_reconstruct():
     print()
 
     try:
-        response = requests.post(API_URL, json=event_data, timeout=300)
+        # 提交任务后轮询任务状态，不再长时间占用一个 HTTP 连接
+        response = requests.post(API_URL, json=event_data, timeout=10)
         response.raise_for_status()
+        job_id = response.json()["job_id"]
+        print(f"任务 ID: {job_id}")
+
+        while True:
+            response = requests.get(f"{API_URL}/{job_id}", timeout=10)
+            response.raise_for_status()
+            job = response.json()
+            print(f"任务状态: {job['status']}, 进度: {json.dumps(job['progress'], ensure_ascii=False)}")
+            if job["status"] not in ("queued", "running"):
+                break
+            time.sleep(POLL_INTERVAL)
+
+        if job["status"] != "succeeded":
+            print(f"任务未完成: {job['status']} {job.get('error') or ''}")
+            return
 
-        result = response.json()
+        result = job["result"][0]
 
         print("=" * 60)
         print("响应状态:", response.status_code)
         print("=" * 60)
-        print(f"事件名称: {result.get('event', {}).get('event_name')}")
-        print(f"事件时间: {result.get('event', {}).get('event_time')}")
-        print(f"内部用户: {result.get('event', {}).get('internal_users')}")
-        print(f"外部用户: {result.get('event', {}).get('external_users')}")
-        print(f"记录数量: {len(result.get('records', []))}")
-        print("=" * 60)
-
-        if result.get('records'):
-            print("\n前 3 条记录预览:")
-            for i, record in enumerate(result['records'][:3], 1):
-                print(f"\n记录 {i}:")
-                print(f"  时间: {record.get('start_time')} ~ {record.get('end_time')}")
-                print(f"  渠道: {record.get('channel')}")
-                print(f"  内部用户: {record.get('internal_user')}")
-                print(f"  外部用户: {record.get('external_user')}")
-                score = record.get('score', {})
-                print(f"  时间得分: {score.get('time_score', 0):.2f}")
-                print(f"  用户得分: {score.get('user_score', 0):.2f}")
-                print(f"  内容得分: {score.get('content_score', 0):.2f}")
-                print(f"  总体得分: {score.get('total_score', 0):.2f}")
-                risk = record.get('risk', {})
-                print(f"  风险等级: {risk.get('risk_level')}")
-                print(f"  风险描述: {risk.get('risk_description')}")
-
+        print_result(result)
         print("\n完整响应:")
         print(json.dumps(result, ensure_ascii=False, indent=2))
 
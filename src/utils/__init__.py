@@ -1,11 +1,15 @@
 from .config import load_config
 from .logger import setup_logger
-from .llm import vllm_qwen3, dashscope_qwen, dashscope_qwen_openai
+from .http import get_http_client, close_http_client
+from .llm import vllm_qwen3, dashscope_qwen, dashscope_qwen_openai, dashscope_qwen_openai_async
 
 __all__ = [
     "load_config",
     "setup_logger",
+    "get_http_client",
+    "close_http_client",
     "vllm_qwen3",
     "dashscope_qwen",
     "dashscope_qwen_openai",
+    "dashscope_qwen_openai_async",
 ]
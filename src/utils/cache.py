@@ -0,0 +1,175 @@
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from .config import load_config
+
+
+config = load_config()
+CACHE_CONFIG = config.get("CACHE", {})
+
+# 本地缓存目录，可在 config.toml 的 [CACHE] 中覆盖
+CACHE_DIR = Path(CACHE_CONFIG.get("DIR", Path(__file__).parent.parent / "cache"))
+
+
+class SqliteCache:
+    """
+    基于 SQLite 的本地持久化键值缓存。
+
+    - 超过 max_bytes 时按最近访问时间淘汰（LRU）
+    - 设置 ttl 时，超过有效期的条目视为未命中
+    - 记录命中和未命中次数
+
+    Args:
+        name (str): 缓存名称，对应 CACHE_DIR 下的 <name>.sqlite3 文件。
+        max_bytes (int | None, optional): 缓存值的总大小上限（字节），None 表示不限制。
+        ttl (float | None, optional): 条目有效期（秒），None 表示永不过期。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+    ):
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        self.name = name
+        self.path = CACHE_DIR / f"{name}.sqlite3"
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed_at ON cache (accessed_at)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        """
+        批量读取缓存。
+
+        参数:
+            keys (list[str]): 缓存键列表。
+
+        返回:
+            dict[str, str]: 命中的缓存键 -> 缓存值。
+        """
+
+        if not keys:
+            return {}
+
+        now = time.time()
+        found = {}
+        with self._lock:
+            # SQLite 单条语句的参数数量有限，分批查询
+            for i in range(0, len(keys), 500):
+                batch = keys[i : i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, value, created_at FROM cache WHERE key IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for key, value, created_at in rows:
+                    if self.ttl is None or now - created_at <= self.ttl:
+                        found[key] = value
+
+            if found:
+                self._conn.executemany(
+                    "UPDATE cache SET accessed_at = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+
+        return found
+
+    def set_many(self, items: dict[str, str]):
+        """
+        批量写入缓存，超过大小上限时淘汰最久未访问的条目。
+
+        参数:
+            items (dict[str, str]): 缓存键 -> 缓存值。
+        """
+
+        if not items:
+            return
+
+        now = time.time()
+        rows = [(key, value, len(value.encode("utf-8")), now, now) for key, value in items.items()]
+        with self._lock:
+            placeholders = ",".join("?" * len(items))
+            replaced = self._conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM cache WHERE key IN ({placeholders})",
+                list(items),
+            ).fetchone()[0]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._size += sum(row[2] for row in rows) - replaced
+            self._evict()
+            self._conn.commit()
+
+    def get(self, key: str) -> str | None:
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, value: str):
+        self.set_many({key: value})
+
+    def _evict(self):
+        if self.max_bytes is None or self._size <= self.max_bytes:
+            return
+
+        cursor = self._conn.execute("SELECT key, size FROM cache ORDER BY accessed_at ASC")
+        evicted = []
+        for key, size in cursor:
+            if self._size <= self.max_bytes:
+                break
+            evicted.append((key,))
+            self._size -= size
+
+        self._conn.executemany("DELETE FROM cache WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+            self._size = 0
+
+    def stats(self) -> dict:
+        """
+        缓存统计信息。
+
+        返回:
+            dict: {"name": "content", "entries": 10, "bytes": 1024, "hits": 5, "misses": 5, "hit_rate": 0.5, "evictions": 0}。
+        """
+
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "entries": entries,
+            "bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+        }
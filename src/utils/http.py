@@ -0,0 +1,83 @@
+import asyncio
+import weakref
+from urllib.parse import urlsplit
+
+import httpx
+from .config import load_config
+
+
+config = load_config()
+HTTP_CONFIG = config.get("HTTP", {})
+
+# 连接池参数，可在 config.toml 的 [HTTP] 中覆盖
+MAX_CONNECTIONS = HTTP_CONFIG.get("MAX_CONNECTIONS", 100)  # 全局最大连接数
+MAX_CONNECTIONS_PER_HOST = HTTP_CONFIG.get("MAX_CONNECTIONS_PER_HOST", 20)  # 单个主机最大连接数
+MAX_KEEPALIVE_CONNECTIONS = HTTP_CONFIG.get("MAX_KEEPALIVE_CONNECTIONS", 20)  # 保持活跃的空闲连接数
+KEEPALIVE_EXPIRY = HTTP_CONFIG.get("KEEPALIVE_EXPIRY", 30.0)  # 空闲连接保持时间（秒）
+HTTP2 = HTTP_CONFIG.get("HTTP2", True)  # 服务端支持时使用 HTTP/2
+TIMEOUT = HTTP_CONFIG.get("TIMEOUT", 30.0)  # 请求超时时间（秒）
+
+# 需要单独限制连接数的主机（CCS 服务器）
+LIMITED_HOSTS = [config["CCS_SERVER"]["API_BASE_URL"]]
+
+# 每个事件循环一个客户端，避免连接跨事件循环复用
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _host_pattern(url: str) -> str:
+    parts = urlsplit(url)
+    return f"all://{parts.netloc}"
+
+
+def _create_client() -> httpx.AsyncClient:
+    host_limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS_PER_HOST,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+    mounts = {
+        _host_pattern(url): httpx.AsyncHTTPTransport(limits=host_limits, http2=HTTP2)
+        for url in LIMITED_HOSTS
+    }
+
+    return httpx.AsyncClient(
+        http2=HTTP2,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+        timeout=TIMEOUT,
+        mounts=mounts,
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared async HTTP client of the running event loop.
+
+    The client keeps connections alive between requests, limits the number of
+    connections per host and negotiates HTTP/2 when the server allows it.
+
+    Returns:
+        httpx.AsyncClient: Shared async HTTP client.
+    """
+
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _create_client()
+        _clients[loop] = client
+    return client
+
+
+async def close_http_client():
+    """
+    Close the shared async HTTP client of the running event loop.
+    """
+
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -3,7 +3,7 @@ from agno.agent import Agent
 from agno.models.vllm import VLLM
 from agno.models.dashscope import DashScope
 from .config import load_config
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 
 
 config = load_config()
@@ -35,6 +35,13 @@ dashscope_qwen_openai = OpenAI(
     base_url=config["DASHSCOPE"]["BASE_URL"],
 )
 
+# 异步客户端，重试由调用方控制
+dashscope_qwen_openai_async = AsyncOpenAI(
+    api_key=config["DASHSCOPE"]["API_KEY"],
+    base_url=config["DASHSCOPE"]["BASE_URL"],
+    max_retries=0,
+)
+
 agent = Agent(
     name="AI助手",
     description="你是一个智能助手，能够回答用户的问题；不要思考，直接回答。",
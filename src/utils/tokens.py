@@ -0,0 +1,165 @@
+import hashlib
+import threading
+from pathlib import Path
+from cachetools import LRUCache
+from loguru import logger
+from .config import load_config
+
+
+config = load_config()
+TOKENIZER_CONFIG = config.get("TOKENIZER", {})
+
+# 本地分词器，可在 config.toml 的 [TOKENIZER] 中配置
+# Qwen 系列模型共用同一词表，PATH 指向模型目录中的 tokenizer.json 即可
+TOKENIZER_PATH = TOKENIZER_CONFIG.get("PATH", "")  # 本地 tokenizer.json 路径
+CACHE_SIZE = TOKENIZER_CONFIG.get("CACHE_SIZE", 100_000)  # 内存中缓存的 token 数条目数
+OFFSETS_CACHE_SIZE = TOKENIZER_CONFIG.get("OFFSETS_CACHE_SIZE", 1_000)  # 内存中缓存的分词位置条目数（截断用）
+
+_tokenizer = None
+_loaded = False
+_lock = threading.Lock()
+_counts = LRUCache(maxsize=CACHE_SIZE)
+_offsets = LRUCache(maxsize=OFFSETS_CACHE_SIZE)
+
+
+def _load_tokenizer():
+    if not TOKENIZER_PATH:
+        logger.warning("未配置本地分词器 TOKENIZER.PATH，按字符数估算 token 数")
+        return None
+
+    path = Path(TOKENIZER_PATH)
+    if not path.exists():
+        logger.warning(f"本地分词器文件不存在: {path}，按字符数估算 token 数")
+        return None
+
+    try:
+        from tokenizers import Tokenizer
+    except ImportError:
+        logger.warning("未安装 tokenizers，按字符数估算 token 数")
+        return None
+
+    logger.info(f"加载本地分词器: {path}")
+    return Tokenizer.from_file(str(path))
+
+
+def get_tokenizer():
+    """
+    获取本地分词器，首次调用时加载。
+
+    返回:
+        tokenizers.Tokenizer | None: 本地分词器，未配置或不可用时为 None。
+    """
+
+    global _tokenizer, _loaded
+
+    if not _loaded:
+        with _lock:
+            if not _loaded:
+                _tokenizer = _load_tokenizer()
+                _loaded = True
+    return _tokenizer
+
+
+def has_tokenizer() -> bool:
+    return get_tokenizer() is not None
+
+
+def count_tokens_batch(texts: list[str]) -> list[int]:
+    """
+    批量计算文本的 token 数。
+
+    结果按文本内容的摘要缓存，只对未缓存的文本分词；本地分词器不可用时按字符数估算
+    （中文约一字一个 token，偏保守）。
+
+    参数:
+        texts (list[str]): 文本列表。
+
+    返回:
+        list[int]: 与 texts 一一对应的 token 数。
+    """
+
+    tokenizer = get_tokenizer()
+    if tokenizer is None:
+        return [len(text) for text in texts]
+
+    keys = [hashlib.sha256(text.encode("utf-8")).hexdigest() if text else "" for text in texts]
+    with _lock:
+        counts = {key: _counts[key] for key in keys if key in _counts}
+    counts[""] = 0
+
+    missing = {key: text for key, text in zip(keys, texts) if key not in counts}
+    if missing:
+        encodings = tokenizer.encode_batch(list(missing.values()), add_special_tokens=False)
+        new_counts = {key: len(encoding.ids) for key, encoding in zip(missing, encodings)}
+        with _lock:
+            _counts.update(new_counts)
+        counts.update(new_counts)
+
+    return [counts[key] for key in keys]
+
+
+def token_offsets(text: str) -> list[int]:
+    """
+    计算文本中每个 token 的起始字符位置，结果按文本内容的摘要缓存，同一文本按不同长度截断时只分词一次。
+
+    参数:
+        text (str): 文本。
+
+    返回:
+        list[int]: 每个 token 在 text 中的起始位置；本地分词器不可用时每个字符一个 token。
+    """
+
+    tokenizer = get_tokenizer()
+    if tokenizer is None:
+        return list(range(len(text)))
+
+    key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    with _lock:
+        offsets = _offsets.get(key)
+    if offsets is None:
+        offsets = [start for start, _ in tokenizer.encode(text, add_special_tokens=False).offsets]
+        with _lock:
+            _offsets[key] = offsets
+            _counts[key] = len(offsets)
+    return offsets
+
+
+def count_tokens(text: str) -> int:
+    """
+    计算文本的 token 数。
+
+    参数:
+        text (str): 文本。
+
+    返回:
+        int: token 数。
+    """
+
+    return count_tokens_batch([text])[0]
+
+
+def truncate_to_tokens(text: str, max_tokens: int, suffix: str = "……") -> str:
+    """
+    截断文本，使其（含截断标记）token 数不超过 max_tokens。
+
+    参数:
+        text (str): 文本。
+        max_tokens (int): token 数上限。
+        suffix (str): 截断标记，文本被截断时追加在末尾。
+
+    返回:
+        str: 截断后的文本，未超过上限时原样返回。
+    """
+
+    offsets = token_offsets(text)
+    if len(offsets) <= max_tokens:
+        return text
+
+    budget = max_tokens - count_tokens(suffix)
+    # 在第 budget + 1 个 token 的起始位置截断；截断处与标记重新分词后可能略有变化，超出时再缩短
+    while budget > 0:
+        truncated = text[: offsets[budget]] + suffix
+        if count_tokens(truncated) <= max_tokens:
+            return truncated
+        budget -= 1
+    return ""